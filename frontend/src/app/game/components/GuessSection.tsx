@@ -1,6 +1,6 @@
 'use client';
 
-import { GameResult } from '../types';
+import { GameResult, PriceEstimate } from '../types';
 
 interface GuessSectionProps {
   hasSearched: boolean;
@@ -9,6 +9,8 @@ interface GuessSectionProps {
   setUserGuess: (guess: string) => void;
   gameResult: GameResult | null;
   handleGuess: () => void;
+  priceEstimate: PriceEstimate | null;
+  fetchPriceEstimate: () => void;
 }
 
 export default function GuessSection({
@@ -17,7 +19,9 @@ export default function GuessSection({
   userGuess,
   setUserGuess,
   gameResult,
-  handleGuess
+  handleGuess,
+  priceEstimate,
+  fetchPriceEstimate
 }: GuessSectionProps) {
   if (!hasSearched) return null;
 
@@ -63,6 +67,32 @@ export default function GuessSection({
         </button>
       </div>
 
+      {/* Price Hint from the target's most similar listings */}
+      <div className="mt-4 flex flex-wrap items-center gap-4">
+        <button
+          onClick={fetchPriceEstimate}
+          disabled={!!gameResult || !!priceEstimate}
+          className={`bg-white/10 hover:bg-white/20 text-yellow-200 px-4 py-2 rounded-xl border border-yellow-400/30 text-sm font-medium transition-all duration-500 ease-out ${
+            gameResult || priceEstimate ? 'opacity-50 cursor-not-allowed' : ''
+          }`}
+        >
+          💡 Price Hint
+        </button>
+        {priceEstimate && (
+          priceEstimate.median === null ? (
+            <span className="text-sm text-gray-300">No priced neighbors found for a hint.</span>
+          ) : (
+            <span className="text-sm text-gray-300">
+              {priceEstimate.neighbors} similar properties: median <span className="text-yellow-300 font-semibold">${priceEstimate.median.toLocaleString()}</span>,
+              middle half ${priceEstimate.q1?.toLocaleString()} - ${priceEstimate.q3?.toLocaleString()}
+              {priceEstimate.price_per_sqft_estimate !== null && (
+                <>, by price per sq ft <span className="text-yellow-300 font-semibold">${priceEstimate.price_per_sqft_estimate.toLocaleString()}</span></>
+              )}
+            </span>
+          )
+        )}
+      </div>
+
       {/* Game Result */}
       {gameResult && (
         <div className={`mt-6 p-8 rounded-2xl shadow-lg border-l-4 backdrop-blur-xl transition-all duration-500 ease-out animate-in slide-in-from-right-4 fade-in duration-700 ${
@@ -2,7 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import Link from 'next/link';
-import { Property, SearchResult, GameResult } from './types';
+import { Property, SearchResult, GameResult, PriceEstimate } from './types';
 import { getRandomLoadingMessage } from './utils';
 import ResultModal from './components/ResultModal';
 import GameInstructions from './components/GameInstructions';
@@ -27,10 +27,13 @@ const PropertyMap = dynamic(() => import('../components/PropertyMap'), {
 export default function Game() {
   console.log('Game component rendered');
   const [targetProperty, setTargetProperty] = useState<Property | null>(null);
+  // Issued with the target; the backend scores exactly one guess per token
+  const [gameToken, setGameToken] = useState<string | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
   const [searchResults, setSearchResults] = useState<SearchResult | null>(null);
   const [userGuess, setUserGuess] = useState('');
   const [gameResult, setGameResult] = useState<GameResult | null>(null);
+  const [priceEstimate, setPriceEstimate] = useState<PriceEstimate | null>(null);
   const [hasSearched, setHasSearched] = useState(false);
   const [loading, setLoading] = useState(false);
   const [showResultModal, setShowResultModal] = useState(false);
@@ -119,18 +122,9 @@ export default function Game() {
     console.log('fetchRandomProperty function called');
     console.log('Starting to fetch random property...');
     try {
-      console.log('Making API call to /api/qdrant/collections/default/points/query');
-      const response = await fetch('/api/qdrant/collections/default/points/query', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          query: { sample: 'random' },
-          limit: 1,
-          with_payload: true,
-        }),
-      });
+      console.log('Making API call to /api/superlinked/api/v1/game/target');
+      // The target comes without its price; guesses are scored by the backend
+      const response = await fetch('/api/superlinked/api/v1/game/target');
       console.log('Response status:', response.status);
       console.log('Response headers:', response.headers);
       
@@ -142,56 +136,53 @@ export default function Game() {
       const data = await response.json();
       console.log('Response data:', data);
       
-      if (data.result && data.result.points && data.result.points.length > 0) {
-        const point = data.result.points[0];
-        console.log('Point data:', point);
-        // Transform payload to match expected format
-        const originalEntityId = point.payload['__original_entity_id__'] || '';
-        const realId = originalEntityId.replace('RealEstate:', '');
+      if (data.id && data.fields) {
+        const fields = data.fields;
         
         const transformedProperty = {
-          id: point.id,
-          realId: realId, // Real ID from Superlinked schema
+          id: data.id,
+          realId: data.id, // Real ID from Superlinked schema
           fields: {
-            description: point.payload['__schema_field__RealEstate_description'] || '',
-            streetAddress: point.payload['__schema_field__RealEstate_streetAddress'] || '',
-            city: point.payload['__schema_field__RealEstate_city'] || '',
-            state: point.payload['__schema_field__RealEstate_state'] || '',
-            county: point.payload['__schema_field__RealEstate_county'] || '',
-            price: point.payload['__schema_field__RealEstate_price'] || 0,
-            pricePerSquareFoot: point.payload['__schema_field__RealEstate_pricePerSquareFoot'] || 0,
-            yearBuilt: point.payload['__schema_field__RealEstate_yearBuilt'] || 0,
-            zipcode: point.payload['__schema_field__RealEstate_zipcode'] || 0,
-            longitude: point.payload['__schema_field__RealEstate_longitude'] || 0,
-            latitude: point.payload['__schema_field__RealEstate_latitude'] || 0,
-            livingArea: point.payload['__schema_field__RealEstate_livingArea'] || 0,
-            livingAreaValue: point.payload['__schema_field__RealEstate_livingAreaValue'] || 0,
-            bathrooms: point.payload['__schema_field__RealEstate_bathrooms'] || 0,
-            bedrooms: point.payload['__schema_field__RealEstate_bedrooms'] || 0,
-            buildingArea: point.payload['__schema_field__RealEstate_buildingArea'] || 0,
-            garageSpaces: point.payload['__schema_field__RealEstate_garageSpaces'] || 0,
-            levels: point.payload['__schema_field__RealEstate_levels'] || '',
-            country: point.payload['__schema_field__RealEstate_country'] || '',
-            datePostedString: point.payload['__schema_field__RealEstate_datePostedString'] || '',
-            event: point.payload['__schema_field__RealEstate_event'] || '',
-            currency: point.payload['__schema_field__RealEstate_currency'] || '',
-            lotAreaUnits: point.payload['__schema_field__RealEstate_lotAreaUnits'] || '',
-            homeType: point.payload['__schema_field__RealEstate_homeType'] || '',
-            is_bankOwned: point.payload['__schema_field__RealEstate_is_bankOwned'] || 0,
-            is_forAuction: point.payload['__schema_field__RealEstate_is_forAuction'] || 0,
-            parking: point.payload['__schema_field__RealEstate_parking'] || 0,
-            hasGarage: point.payload['__schema_field__RealEstate_hasGarage'] || 0,
-            pool: point.payload['__schema_field__RealEstate_pool'] || 0,
-            spa: point.payload['__schema_field__RealEstate_spa'] || 0,
-            isNewConstruction: point.payload['__schema_field__RealEstate_isNewConstruction'] || 0,
-            hasPetsAllowed: point.payload['__schema_field__RealEstate_hasPetsAllowed'] || 0,
-            time: point.payload['__schema_field__RealEstate_time'] || 0,
+            description: fields.description || '',
+            streetAddress: fields.streetAddress || '',
+            city: fields.city || '',
+            state: fields.state || '',
+            county: fields.county || '',
+            price: 0, // Hidden until the guess is scored
+            pricePerSquareFoot: 0, // Hidden, price per sqft times living area would give the price away
+            yearBuilt: fields.yearBuilt || 0,
+            zipcode: fields.zipcode || 0,
+            longitude: fields.longitude || 0,
+            latitude: fields.latitude || 0,
+            livingArea: fields.livingArea || 0,
+            livingAreaValue: fields.livingAreaValue || 0,
+            bathrooms: fields.bathrooms || 0,
+            bedrooms: fields.bedrooms || 0,
+            buildingArea: fields.buildingArea || 0,
+            garageSpaces: fields.garageSpaces || 0,
+            levels: fields.levels || '',
+            country: fields.country || '',
+            datePostedString: fields.datePostedString || '',
+            event: fields.event || '',
+            currency: fields.currency || '',
+            lotAreaUnits: fields.lotAreaUnits || '',
+            homeType: fields.homeType || '',
+            is_bankOwned: fields.is_bankOwned || 0,
+            is_forAuction: fields.is_forAuction || 0,
+            parking: fields.parking || 0,
+            hasGarage: fields.hasGarage || 0,
+            pool: fields.pool || 0,
+            spa: fields.spa || 0,
+            isNewConstruction: fields.isNewConstruction || 0,
+            hasPetsAllowed: fields.hasPetsAllowed || 0,
+            time: fields.time || 0,
           },
         };
         console.log('Transformed property:', transformedProperty);
         setTargetProperty(transformedProperty);
+        setGameToken(data.token);
       } else {
-        console.error('No points found in response:', data);
+        console.error('No target property in response:', data);
       }
     } catch (error) {
       console.error('Error fetching random property:', error);
@@ -283,53 +274,55 @@ export default function Game() {
     setLoading(false);
   };
 
-  const handleGuess = () => {
-    if (!targetProperty || !userGuess) return;
+  const handleGuess = async () => {
+    if (!targetProperty || !userGuess || !gameToken) return;
 
     // Clean the user input by removing all non-numeric characters except decimal point
     const cleanedGuess = userGuess.replace(/[^\d.]/g, '');
     const guess = parseFloat(cleanedGuess);
-    const actualPrice = targetProperty.fields.price;
-    const deviation = Math.abs(guess - actualPrice) / actualPrice;
-
-    let medal: 'gold' | 'silver' | 'bronze' | undefined = undefined;
-    let success = false;
-    let message = '';
-
-    if (deviation <= 0.1) {
-      medal = 'gold';
-      success = true;
-      message = 'Congratulations! You won the Gold Medal!';
-    } else if (deviation <= 0.2) {
-      medal = 'silver';
-      success = true;
-      message = 'Congratulations! You won the Silver Medal!';
-    } else if (deviation <= 0.3) {
-      medal = 'bronze';
-      success = true;
-      message = 'Congratulations! You won the Bronze Medal!';
-    } else {
-      success = false;
-      message = 'Sorry, your guess was unsuccessful. Try again!';
+
+    try {
+      const response = await fetch('/api/superlinked/api/v1/game/guess', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ token: gameToken, guess }),
+      });
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+      }
+      setGameToken(null);
+      // Medal, message, actual price and deviation (in percent) as scored by the backend
+      const result: GameResult = await response.json();
+      setGameResult(result);
+      setShowResultModal(true);
+    } catch (error) {
+      console.error('Error scoring guess:', error);
     }
+  };
 
-    setGameResult({
-      success,
-      medal,
-      message,
-      guess,
-      actualPrice,
-      deviation: deviation * 100, // Convert to percentage
-    });
-    setShowResultModal(true);
+  const fetchPriceEstimate = async () => {
+    if (!targetProperty) return;
+    try {
+      const response = await fetch(`/api/superlinked/api/v1/game/estimate/${encodeURIComponent(targetProperty.realId)}`);
+      if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+      }
+      setPriceEstimate(await response.json());
+    } catch (error) {
+      console.error('Error fetching price estimate:', error);
+    }
   };
 
   const resetGame = () => {
     setTargetProperty(null);
+    setGameToken(null);
     setSearchQuery('');
     setSearchResults(null);
     setUserGuess('');
     setGameResult(null);
+    setPriceEstimate(null);
     setHasSearched(false);
     fetchRandomProperty();
   };
@@ -401,6 +394,8 @@ export default function Game() {
             setUserGuess={setUserGuess}
             gameResult={gameResult}
             handleGuess={handleGuess}
+            priceEstimate={priceEstimate}
+            fetchPriceEstimate={fetchPriceEstimate}
           />
 
           <div className="grid grid-cols-1 lg:grid-cols-2 gap-8">
@@ -53,4 +53,15 @@ export interface GameResult {
   guess?: number;
   actualPrice?: number;
   deviation?: number;
-}
\ No newline at end of file
+}
+
+export interface PriceEstimate {
+  id: string;
+  neighbors: number;
+  median: number | null;
+  q1: number | null;
+  q3: number | null;
+  iqr: number | null;
+  price_per_sqft_estimate: number | null;
+  took_ms: number;
+}
@@ -0,0 +1,193 @@
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Collapses the same home listed several times (once per event) into one representative row.
+# Rows are the same home when they share street address and zipcode, or when their descriptions
+# are near-duplicates (MinHash/LSH), their coordinates match to ~10 m and their addresses do not
+# disagree: units of one building share coordinates and often a templated description.
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+MIN_SIMILARITY = 0.8  # estimated Jaccard needed to merge a candidate pair
+COORDINATE_DECIMALS = 4
+
+# Fixed seed so the same input always produces the same groups
+_PRIME = 4294967311  # smallest prime above 2**32
+_rng = np.random.default_rng(42)
+_A = _rng.integers(1, 2**31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2**31, NUM_PERM, dtype=np.uint64)
+
+# Text embeddings computed per row (description, city, street address, county)
+TEXT_EMBEDDINGS_PER_ROW = 4
+
+
+def shingles(text):
+    words = re.findall(r"\w+", str(text).lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words or [""]
+        return np.array([zlib.crc32(" ".join(words).encode())], dtype=np.uint64)
+    return np.unique(np.array(
+        [zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode()) for i in range(len(words) - SHINGLE_WORDS + 1)],
+        dtype=np.uint64,
+    ))
+
+
+def minhash_signatures(texts):
+    signatures = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    for row, text in enumerate(texts):
+        hashes = shingles(text)
+        signatures[row] = ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1)
+    return signatures
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = np.arange(size)
+
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+UNIT_PATTERN = re.compile(r"(?:#|\b(?:apt|apartment|unit|ste|suite|bldg|building|fl|floor|rm|room|lot|spc|space)\b)\s*#?\s*(\w+)")
+
+
+def normalize_address(address):
+    if pd.isna(address):
+        return ""
+    return re.sub(r"[^a-z0-9]+", " ", str(address).lower()).strip()
+
+
+def address_parts(address):
+    """(house number, unit) of a street address, None when the address is missing."""
+    normalized = normalize_address(address)
+    if not normalized:
+        return None
+    number = re.match(r"\d+\w*", normalized)
+    unit = UNIT_PATTERN.search(str(address).lower())
+    return number.group() if number else None, unit.group(1) if unit else None
+
+
+def addresses_agree(a, b):
+    """Same house number and unit, or at least one address missing (None)."""
+    return a is None or b is None or a == b
+
+
+def group_listings(df):
+    """Returns a group number per row; rows describing the same home share a number."""
+    n = len(df)
+    groups = UnionFind(n)
+
+    # Exact: same street address in the same zipcode
+    addresses = df['streetAddress'].map(normalize_address).to_numpy()
+    address_keys = addresses + "|" + df['zipcode'].astype(str).to_numpy()
+    addressed = np.flatnonzero(addresses != "")
+    for rows in pd.Series(addressed, index=addressed).groupby(address_keys[addressed]).groups.values():
+        rows = list(rows)
+        for row in rows[1:]:
+            groups.union(rows[0], row)
+
+    # Near-duplicate descriptions at the same coordinates
+    coordinate_keys = (
+        df['latitude'].astype(float).round(COORDINATE_DECIMALS).astype(str) + ","
+        + df['longitude'].astype(float).round(COORDINATE_DECIMALS).astype(str)
+    ).to_numpy()
+    descriptions = df['description'].fillna("").tolist()
+    signatures = minhash_signatures(descriptions)
+    parts = [address_parts(address) for address in df['streetAddress']]
+    # Address of each group, so a listing without one cannot chain two units of a building together
+    group_address = {}
+    for row in range(n):
+        if parts[row] is not None:
+            group_address[groups.find(row)] = parts[row]
+
+    def merge(a, b):
+        if (signatures[a] == signatures[b]).mean() < MIN_SIMILARITY:
+            return False
+        root_a, root_b = groups.find(a), groups.find(b)
+        address_a, address_b = group_address.get(root_a), group_address.get(root_b)
+        if not addresses_agree(address_a, address_b):
+            return False
+        groups.union(a, b)
+        group_address[groups.find(a)] = address_a or address_b
+        return True
+
+    # Descriptions shorter than one shingle ("tiny condo") say nothing about being the same home
+    candidates = [row for row in range(n) if len(re.findall(r"\w+", descriptions[row])) >= SHINGLE_WORDS]
+    for band in range(BANDS):
+        columns = signatures[:, band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        buckets = {}
+        for row in candidates:
+            buckets.setdefault((coordinate_keys[row], columns[row].tobytes()), []).append(row)
+        for rows in buckets.values():
+            by_address = {}
+            for row in rows:
+                by_address.setdefault(parts[row], []).append(row)
+            unaddressed = by_address.pop(None, [])
+            firsts = [members[0] for members in by_address.values()]
+            for members in by_address.values():
+                for row in members[1:]:
+                    merge(members[0], row)
+            for row in unaddressed:
+                for first in firsts + unaddressed[:1]:
+                    if first != row and merge(first, row):
+                        break
+
+    return np.array([groups.find(row) for row in range(n)])
+
+
+def event_history(group):
+    """Compact 'date|event|price' entries, oldest first, separated by ';'."""
+    group = group.sort_values('time')
+    return ";".join(
+        f"{date}|{event}|{int(price) if pd.notnull(price) else ''}"
+        for date, event, price in zip(group['datePostedString'], group['event'], group['price'])
+    )
+
+
+def collapse_duplicates(df):
+    """Keeps the most recent row of every group with the group's event history; returns (df, report)."""
+    df = df.reset_index(drop=True)
+    group_ids = group_listings(df)
+    sizes = pd.Series(group_ids).value_counts()
+
+    # Most recent event represents the home
+    representatives = df.assign(_group=group_ids).sort_values('time').groupby('_group', sort=False).tail(1)
+    histories = {
+        group: event_history(rows)
+        for group, rows in df.assign(_group=group_ids)[pd.Series(group_ids).map(sizes).to_numpy() > 1].groupby('_group')
+    }
+    representatives = representatives.assign(
+        eventHistory=representatives['_group'].map(histories).fillna("")
+    ).drop(columns=['_group']).sort_index()
+
+    removed = len(df) - len(representatives)
+    report = {
+        'rows_in': len(df),
+        'rows_out': len(representatives),
+        'groups_merged': int((sizes > 1).sum()),
+        'largest_group': int(sizes.max()) if len(sizes) else 0,
+        'text_embeddings_saved': removed * TEXT_EMBEDDINGS_PER_ROW,
+        'index_reduction': removed / max(len(df), 1),
+    }
+    return representatives, report
+
+
+def print_report(report):
+    print(f"Near-duplicate collapse: {report['rows_in']} -> {report['rows_out']} rows "
+          f"({report['index_reduction']:.1%} smaller index), {report['groups_merged']} homes had several listings "
+          f"(largest {report['largest_group']}), {report['text_embeddings_saved']} text embeddings saved")
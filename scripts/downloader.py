@@ -1,6 +1,9 @@
-import kagglehub
-import shutil
+import argparse
+import hashlib
+import json
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 # List of datasets to download
 datasets = [
@@ -12,30 +15,135 @@ datasets = [
 script_dir = os.path.dirname(__file__)
 project_dir = os.path.dirname(script_dir)
 data_dir = os.path.join(project_dir, 'data')
+manifest_path = os.path.join(data_dir, 'manifest.json')
+
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp_path, manifest_path)
+
+
+def file_entry(path, checksum):
+    stat = os.stat(path)
+    return {'sha256': checksum, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def is_current(entry):
+    """Checks that every file recorded for a dataset is still in data/ and unchanged."""
+    if not entry or not entry.get('files'):
+        return False
+    for rel_path, recorded in entry['files'].items():
+        path = os.path.join(data_dir, rel_path)
+        if not os.path.exists(path):
+            return False
+        stat = os.stat(path)
+        if stat.st_size != recorded['size']:
+            return False
+        # Only rehash when the file was touched since it was recorded
+        if stat.st_mtime_ns != recorded['mtime_ns'] and sha256(path) != recorded['sha256']:
+            return False
+    return True
 
-# Ensure data directory exists
-os.makedirs(data_dir, exist_ok=True)
 
-for dataset in datasets:
-    # Download latest version
-    path = kagglehub.dataset_download(dataset)
+def source_identity(path, previous=None):
+    """What the source offers right now: its path (for Kaggle the resolved .../versions/N) and every file in it."""
+    recorded = (previous or {}).get('files', {})
+    files = {}
+    for root, _, names in os.walk(path):
+        for name in names:
+            src = os.path.join(root, name)
+            rel_path = os.path.relpath(src, path)
+            stat = os.stat(src)
+            known = recorded.get(rel_path, {})
+            # Only rehash source files whose size or mtime changed
+            unchanged = known.get('size') == stat.st_size and known.get('mtime_ns') == stat.st_mtime_ns
+            files[rel_path] = file_entry(src, known['sha256'] if unchanged else sha256(src))
+    return {'path': os.path.abspath(path), 'files': files}
+
+
+def fetch(dataset, source_dir, force=False):
+    """Returns a directory holding the dataset files."""
+    if source_dir:
+        # Local directory standing in for Kaggle, laid out as <source_dir>/<owner>/<dataset>/
+        return os.path.join(source_dir, dataset)
+    import kagglehub
+    # Resolves the latest version and only downloads it when it is not in the Kaggle cache yet
+    return kagglehub.dataset_download(dataset, force_download=force)
+
+
+def place(src, dst):
+    """Hard-links src to dst instead of copying the bytes; the source stays where it is."""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem (or no hard-link support), fall back to a copy
+        shutil.copy2(src, dst)
+
+
+def acquire(dataset, entry, source_dir=None, force=False):
+    """Places a dataset into data/ unless the manifest shows the same source version is already there."""
+    path = fetch(dataset, source_dir, force)
+    source = source_identity(path, (entry or {}).get('source'))
+    if not force and (entry or {}).get('source') == source and is_current(entry):
+        print(f"Dataset {dataset} is unchanged, skipping")
+        return entry
     print(f"Path to dataset files for {dataset}:", path)
 
-    # Copy files to data folder, merging if necessary
-    for item in os.listdir(path):
-        s = os.path.join(path, item)
-        d = os.path.join(data_dir, item)
-        if os.path.isdir(s):
-            if os.path.exists(d):
-                shutil.rmtree(d)
-            shutil.copytree(s, d)
-        else:
-            shutil.copy2(s, d)
+    files = {}
+    for rel_path, recorded in source['files'].items():
+        src = os.path.join(path, rel_path)
+        dst = os.path.join(data_dir, rel_path)
+        if not (os.path.exists(dst) and sha256(dst) == recorded['sha256']):
+            # The source stays intact (local stand-in or Kaggle cache), so the next run can compare against it
+            place(src, dst)
+        files[rel_path] = file_entry(dst, recorded['sha256'])
+
+    print(f"Dataset {dataset} files placed in:", data_dir)
+    return {'source': source, 'files': files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the Kaggle datasets into data/.")
+    parser.add_argument('--source-dir', help="Local directory used instead of Kaggle (offline runs).")
+    parser.add_argument('--force', action='store_true', help="Download even if the manifest is current.")
+    parser.add_argument('--workers', type=int, default=len(datasets), help="Concurrent downloads.")
+    args = parser.parse_args()
+
+    # Ensure data directory exists
+    os.makedirs(data_dir, exist_ok=True)
+
+    manifest = load_manifest()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {
+            dataset: pool.submit(acquire, dataset, manifest.get(dataset), args.source_dir, args.force)
+            for dataset in datasets
+        }
+        for dataset, future in futures.items():
+            manifest[dataset] = future.result()
+    save_manifest(manifest)
 
-    print(f"Dataset {dataset} files copied to:", data_dir)
+    print("All datasets downloaded and merged successfully.")
 
-    # Remove the original downloaded files
-    shutil.rmtree(path)
-    print(f"Original files for {dataset} removed from:", path)
 
-print("All datasets downloaded and merged successfully.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
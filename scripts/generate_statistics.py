@@ -1,16 +1,24 @@
 import pandas as pd
 import json
 import os
+import sys
+
+# Make the superlinked_app package importable when run as `python scripts/generate_statistics.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from superlinked_app.dtypes import compact_dtypes, memory_report, read_dtypes
 
 # Read the CSV file
 csv_file = 'data/processed_real_estate.csv'
-df = pd.read_csv(csv_file)
+df = pd.read_csv(csv_file, dtype=read_dtypes(compact=True))
+memory_report(df, "statistics input")
+compact_dtypes(df)
+memory_report(df, "statistics compacted")
 
 # Dict to store statistics
 stats = {}
 
 # Min and max for numeric columns
-numeric_cols = df.select_dtypes(include=['int64', 'float64', 'Int64']).columns
+numeric_cols = df.select_dtypes(include='number').columns
 for col in numeric_cols:
     stats[col] = {
         'type': 'numeric',
@@ -19,10 +27,10 @@ for col in numeric_cols:
     }
 
 # Unique values for categorical columns
-categorical_cols = df.select_dtypes(include=['object']).columns
+categorical_cols = df.select_dtypes(include=['object', 'category']).columns
 for col in categorical_cols:
-    if col in ['id', 'datePostedString', 'streetAddress', 'description']:
-        # Skip saving unique values for 'id', 'datePostedString', 'streetAddress', and 'description' columns to avoid large JSON
+    if col in ['id', 'datePostedString', 'streetAddress', 'description', 'eventHistory']:
+        # Skip saving unique values for 'id', 'datePostedString', 'streetAddress', 'description' and 'eventHistory' columns to avoid large JSON
         stats[col] = {
             'type': 'categorical',
             'unique_values': []
@@ -0,0 +1,164 @@
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+from mock_llm import start_in_background
+
+# Queries in the style players type into the search box
+natural_queries = [
+    "3 bedroom houses with a pool",
+    "condos under 500k",
+    "single family homes around 2000 sqft",
+    "townhouses between 400k and 700k with garage",
+    "new construction with at least 2 bathrooms",
+    "homes sold recently near the target",
+    "apartments around 100 square meters",
+    "multi-level homes over 1M with ocean view",
+]
+
+
+class Stats:
+    """Thread-safe latency and error bookkeeping per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.games = 0
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def game_finished(self):
+        with self.lock:
+            self.games += 1
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    position = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[position]
+
+
+def call(stats, endpoint, url, payload=None, headers=None):
+    """POSTs payload (GET without one) and records the latency; returns the decoded body or None on error."""
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode() if payload is not None else None,
+        method='POST' if payload is not None else 'GET',
+        headers={'Content-Type': 'application/json', **(headers or {})},
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            body = json.loads(response.read())
+        stats.record(endpoint, time.perf_counter() - start, True)
+        return body
+    except (OSError, http.client.HTTPException, ValueError):
+        # URLError and timeouts are OSErrors; dropped connections surface unwrapped from getresponse()
+        stats.record(endpoint, time.perf_counter() - start, False)
+        return None
+
+
+def think(args):
+    if args.think_time > 0:
+        time.sleep(random.expovariate(1 / args.think_time))
+
+
+def play(args, stats, deadline):
+    """One player running the game loop from frontend/src/app/game/page.tsx until the deadline."""
+    while time.time() < deadline:
+        # New game: random target without its price
+        target = call(stats, 'target', f"{args.api_url}/api/v1/game/target")
+        if not target:
+            think(args)
+            continue
+        real_id = target['id']
+
+        for _ in range(random.randint(1, args.max_searches)):
+            think(args)
+            call(stats, 'property', f"{args.api_url}/api/v1/search/property", {
+                'natural_query': random.choice(natural_queries),
+                'limit': 30,
+                'ids_exclude': [real_id],
+            }, headers={'x-include-metadata': 'True'})
+
+            if random.random() < args.similar_ratio:
+                call(stats, 'similar_property', f"{args.api_url}/api/v1/search/similar_property", {
+                    'id': real_id,
+                    'limit': 30,
+                    'ids_exclude': [real_id],
+                }, headers={'x-include-metadata': 'True'})
+
+        if random.random() < args.hint_ratio:
+            think(args)
+            call(stats, 'estimate', f"{args.api_url}/api/v1/game/estimate/{real_id}")
+
+        think(args)
+        call(stats, 'guess', f"{args.api_url}/api/v1/game/guess", {
+            'token': target['token'],
+            'guess': random.randint(50, 2000) * 1000,
+        })
+        stats.game_finished()
+
+
+def report(stats, elapsed, players):
+    total = sum(len(values) for values in stats.latencies.values())
+    errors = sum(stats.errors.values())
+    print(f"\n{players} players, {elapsed:.1f}s, {stats.games} games, "
+          f"{total / elapsed:.2f} req/s, {stats.games / elapsed:.2f} games/s, "
+          f"error rate {errors / max(total, 1):.2%}")
+    print(f"{'Endpoint':<18} {'Requests':>8} {'Errors':>7} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for endpoint, values in sorted(stats.latencies.items()):
+        row = [percentile(values, q) * 1000 for q in (50, 90, 95, 99, 100)]
+        print(f"{endpoint:<18} {len(values):>8} {stats.errors[endpoint]:>7} " + " ".join(f"{v:>8.0f}" for v in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate game players against the backend.")
+    parser.add_argument('--api-url', default='http://localhost:8080')
+    parser.add_argument('--players', type=int, default=10, help="Concurrent players.")
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds to run.")
+    parser.add_argument('--ramp-up', type=float, default=5.0, help="Seconds over which players join.")
+    parser.add_argument('--think-time', type=float, default=2.0, help="Mean seconds between player actions.")
+    parser.add_argument('--max-searches', type=int, default=3, help="Searches per game, drawn from 1..N.")
+    parser.add_argument('--similar-ratio', type=float, default=0.3, help="Chance of a similar_property call per search.")
+    parser.add_argument('--hint-ratio', type=float, default=0.5, help="Chance of asking for a price estimate per game.")
+    parser.add_argument('--mock-llm-port', type=int, default=0,
+                        help="Start the mock LLM on this port (backend must use OPENAI_BASE_URL pointing at it).")
+    parser.add_argument('--mock-llm-latency-ms', type=float, default=400.0)
+    parser.add_argument('--mock-llm-error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.mock_llm_port:
+        start_in_background(port=args.mock_llm_port, latency_ms=args.mock_llm_latency_ms,
+                            error_rate=args.mock_llm_error_rate)
+        print(f"Mock LLM listening on http://0.0.0.0:{args.mock_llm_port}/v1/")
+
+    stats = Stats()
+    start = time.time()
+    deadline = start + args.duration
+    players = []
+    for i in range(args.players):
+        player = threading.Thread(target=play, args=(args, stats, deadline), daemon=True)
+        player.start()
+        players.append(player)
+        if args.players > 1:
+            time.sleep(args.ramp_up / args.players)
+    for player in players:
+        player.join()
+
+    report(stats, time.time() - start, args.players)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Minimal OpenAI-compatible chat completions server standing in for the NLQ model.
+# Point the backend at it with OPENAI_BASE_URL=http://<host>:<port>/v1/
+
+
+def empty_value(schema):
+    """Returns the 'nothing extracted' value for a JSON schema property."""
+    types = [schema.get('type')] + [option.get('type') for option in schema.get('anyOf', [])]
+    if 'null' in types:
+        return None
+    if 'array' in types:
+        return []
+    return None
+
+
+def empty_arguments(schema):
+    """Builds arguments matching a JSON schema with every parameter empty."""
+    return {name: empty_value(prop) for name, prop in (schema or {}).get('properties', {}).items()}
+
+
+def completion_choice(request):
+    """Answers like the model would: a tool call when tools are offered (instructor's TOOLS mode), else content."""
+    tools = request.get('tools') or []
+    if tools:
+        function = tools[0]['function']
+        arguments = json.dumps(empty_arguments(function.get('parameters')))
+        tool_call = {
+            'id': f"call_mock_{random.getrandbits(32):x}",
+            'type': 'function',
+            'function': {'name': function['name'], 'arguments': arguments},
+        }
+        message = {'role': 'assistant', 'content': None, 'refusal': None, 'tool_calls': [tool_call]}
+        return {'index': 0, 'message': message, 'finish_reason': 'tool_calls'}, arguments
+    schema = (request.get('response_format') or {}).get('json_schema', {}).get('schema')
+    content = json.dumps(empty_arguments(schema))
+    message = {'role': 'assistant', 'content': content, 'refusal': None}
+    return {'index': 0, 'message': message, 'finish_reason': 'stop'}, content
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    latency_ms = 400.0
+    jitter_ms = 150.0
+    error_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self.send_json(200, {'object': 'list', 'data': [{'id': 'mock', 'object': 'model'}]})
+        else:
+            self.send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        time.sleep(max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000)
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_json(404, {'error': {'message': 'not found'}})
+            return
+        if random.random() < self.error_rate:
+            self.send_json(503, {'error': {'message': 'mock overloaded', 'type': 'server_error'}})
+            return
+
+        choice, output = completion_choice(request)
+        prompt_tokens = sum(len(str(m.get('content', ''))) for m in request.get('messages', [])) // 4
+        self.send_json(200, {
+            'id': f"chatcmpl-mock-{random.getrandbits(32):x}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [choice],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': len(output) // 4,
+                'total_tokens': prompt_tokens + len(output) // 4,
+            },
+        })
+
+
+def create_server(host='0.0.0.0', port=8090, latency_ms=400.0, jitter_ms=150.0, error_rate=0.0):
+    handler = type('ConfiguredMockLLMHandler', (MockLLMHandler,), {
+        'latency_ms': latency_ms, 'jitter_ms': jitter_ms, 'error_rate': error_rate,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_in_background(**kwargs):
+    """Starts the mock server on a daemon thread and returns it."""
+    server = create_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible server for offline load tests.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency-ms', type=float, default=400.0, help="Mean completion latency.")
+    parser.add_argument('--jitter-ms', type=float, default=150.0, help="Standard deviation of the latency.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of completions answered with 503.")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate)
+    print(f"Mock LLM listening on http://{args.host}:{args.port}/v1/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+# Make the superlinked_app package importable when run as `python scripts/pipeline.py`
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(script_dir)
+sys.path.insert(0, project_dir)
+from superlinked_app.config import settings
+from superlinked_app.dtypes import read_dtypes
+from superlinked_app.sharding import hosted_datasets, shard_dataset_path, shard_url
+
+state_dir = os.path.join(project_dir, 'data', '.pipeline')
+state_path = os.path.join(state_dir, 'state.json')
+
+# A stage reruns when the fingerprint of its inputs, code and settings changes or an output is missing;
+# an 'always' stage runs every time and decides itself what to skip
+Stage = namedtuple("Stage", ["name", "deps", "inputs", "outputs", "settings", "run", "always"], defaults=[False])
+
+# Fields of column_statistics.json that shape the vector spaces in index.py
+INDEX_STATISTICS = {
+    'numeric': ['price', 'pricePerSquareFoot', 'bedrooms', 'bathrooms', 'livingArea'],
+    'categorical': ['homeType', 'event', 'levels'],
+}
+
+
+def project_path(path):
+    return path if os.path.isabs(path) else os.path.join(project_dir, path)
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def file_digest(path, cache):
+    """sha256 of a file, reusing the cached digest while size and mtime are unchanged."""
+    stat = os.stat(path)
+    key = f"{stat.st_size}:{stat.st_mtime_ns}"
+    cached = cache.get(path)
+    if cached and cached['key'] == key:
+        return cached['sha256']
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    cache[path] = {'key': key, 'sha256': digest.hexdigest()}
+    return cache[path]['sha256']
+
+
+def fingerprint(stage, cache):
+    digest = hashlib.sha256()
+    for path in stage.inputs:
+        path = project_path(path)
+        digest.update(path.encode())
+        digest.update(file_digest(path, cache).encode() if os.path.exists(path) else b'missing')
+    for field in stage.settings:
+        digest.update(f"{field}={getattr(settings, field)!r}".encode())
+    return digest.hexdigest()
+
+
+def run_script(name):
+    def run():
+        subprocess.run([sys.executable, os.path.join(script_dir, name)], check=True, cwd=project_dir)
+    return run
+
+
+def post_json(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else b''
+    request = urllib.request.Request(url, data=data, method='POST', headers={'Content-Type': 'application/json'})
+    # A batch is embedded before the response comes back, which takes far longer than a search
+    with urllib.request.urlopen(request, timeout=settings.ingest_timeout) as response:
+        return response.read()
+
+
+def index_fingerprint():
+    """Fingerprint of everything that changes the vectors themselves, so a change forces a full re-embed."""
+    statistics = load_json(project_path(settings.path_schema), {})
+    relevant = {
+        col: [statistics.get(col, {}).get('min'), statistics.get(col, {}).get('max')]
+        for col in INDEX_STATISTICS['numeric']
+    }
+    relevant.update({
+        col: statistics.get(col, {}).get('unique_values', [])
+        for col in INDEX_STATISTICS['categorical']
+    })
+    with open(project_path('superlinked_app/index.py'), 'rb') as f:
+        index_code = hashlib.sha256(f.read()).hexdigest()
+    return hashlib.sha256(
+        json.dumps([relevant, index_code, settings.text_embedder_name], sort_keys=True).encode()
+    ).hexdigest()
+
+
+def ingest(loader_name, dataset_path, base_url):
+    """Re-embeds only new or changed rows unless the index definition itself changed."""
+    def run():
+        snapshot_path = os.path.join(state_dir, f"{loader_name}.rows.json")
+        snapshot = load_json(snapshot_path, {})
+        df = pd.read_csv(project_path(dataset_path), dtype=read_dtypes())
+        ids = df['id'].astype(str)
+        hashes = pd.util.hash_pandas_object(df, index=False).astype(str)
+        index_key = index_fingerprint()
+
+        # A new index definition invalidates every stored vector
+        rows = snapshot.get('rows', {}) if snapshot.get('index') == index_key else {}
+        changed = [rows.get(row_id) != row_hash for row_id, row_hash in zip(ids, hashes)]
+        delta, delta_ids, delta_hashes = df[changed], ids[changed], hashes[changed]
+        kind = "changed" if rows else "all"
+        print(f"{loader_name}: ingesting {len(delta)} rows ({kind}) of {len(df)}")
+
+        # Rows ingested by earlier runs that left the dataset, e.g. duplicates collapsed by scripts/dedup.py.
+        # They stay in the snapshot until deleted, so a failed run retries them
+        current = set(ids)
+        previous = snapshot.get('rows', {})
+        removed = [row_id for row_id in previous if row_id not in current]
+        rows.update({row_id: previous[row_id] for row_id in removed})
+
+        # The REST source embeds and writes a batch before answering, unlike the data loader's background task,
+        # so the snapshot only ever lists rows that really are in the index
+        try:
+            for start in range(0, len(delta), settings.chunk_size):
+                end = start + settings.chunk_size
+                records = json.loads(delta.iloc[start:end].to_json(orient='records'))
+                post_json(f"{base_url}/api/v1/ingest/real_estate", records)
+                rows.update(zip(delta_ids.iloc[start:end], delta_hashes.iloc[start:end]))
+            for start in range(0, len(removed), settings.chunk_size):
+                batch = removed[start:start + settings.chunk_size]
+                post_json(f"{base_url}/api/v1/bulk-ingest/real_estate/delete", {'ids': batch})
+                for row_id in batch:
+                    del rows[row_id]
+        finally:
+            save_json(snapshot_path, {'index': index_key, 'rows': rows})
+        print(f"{loader_name}: ingested {len(delta)} rows, deleted {len(removed)}")
+    return run
+
+
+def build_stages():
+    raw_files = ['data/RealEstate_California.csv', 'data/RealEstate_Georgia.csv']
+    dataset_files = (
+        [shard_dataset_path(shard) for shard in settings.shards] if settings.shards else [settings.path_dataset]
+    )
+    stages = [
+        # The downloader's manifest knows whether the Kaggle version or mirror changed, so it always runs
+        Stage('download', [], ['scripts/downloader.py'], raw_files, [], run_script('downloader.py'), always=True),
+        Stage(
+            'preprocess', ['download'],
+            ['scripts/preprocess.py', 'scripts/dedup.py', 'superlinked_app/dtypes.py', *raw_files],
+            [settings.path_dataset, *dataset_files],
+            ['shards', 'path_shards'],
+            run_script('preprocess.py'),
+        ),
+        Stage(
+            'statistics', ['preprocess'],
+            ['scripts/generate_statistics.py', 'superlinked_app/dtypes.py', settings.path_dataset],
+            [settings.path_schema], [],
+            run_script('generate_statistics.py'),
+        ),
+    ]
+
+    # Shards are ingested by independent stages so they run in parallel
+    index_settings = ['text_embedder_name', 'chunk_size', 'qdrant_url']
+    for loader_name, dataset_path in hosted_datasets():
+        shard = loader_name[len('properties_'):]
+        base_url = shard_url(shard) if settings.shards else settings.superlinked_url.rstrip('/')
+        stages.append(Stage(
+            f"index:{loader_name}", ['statistics'],
+            [dataset_path, settings.path_schema, 'superlinked_app/index.py'],
+            [], index_settings,
+            ingest(loader_name, dataset_path, base_url),
+        ))
+    return stages
+
+
+def run_pipeline(stages, force=(), dry_run=False, workers=4):
+    state = load_json(state_path, {'stages': {}, 'digests': {}})
+    cache = state['digests']
+    timings = []
+    pending = {stage.name: stage for stage in stages}
+    done = set()
+    failed = set()
+    running = {}
+    would_run = set()
+
+    def submit(pool, stage):
+        key = fingerprint(stage, cache)
+        outputs_exist = all(os.path.exists(project_path(path)) for path in stage.outputs)
+        # In a dry run the outputs of stages that would run are stale, so their dependents would run too
+        upstream_changes = dry_run and any(dep in would_run for dep in stage.deps)
+        if (stage.name not in force and state['stages'].get(stage.name) == key and outputs_exist
+                and not upstream_changes and not stage.always):
+            timings.append((stage.name, 'cached', 0.0))
+            return None
+        if dry_run and stage.always:
+            # Whether it changes anything is only known by running it
+            timings.append((stage.name, 'would check', 0.0))
+            return None
+        if dry_run:
+            would_run.add(stage.name)
+            timings.append((stage.name, 'would run', 0.0))
+            return None
+
+        def execute():
+            start = time.perf_counter()
+            stage.run()
+            return key, time.perf_counter() - start
+        return pool.submit(execute)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if any(dep in failed for dep in stage.deps):
+                    timings.append((name, 'skipped', 0.0))
+                    failed.add(name)
+                    del pending[name]
+                elif all(dep in done for dep in stage.deps):
+                    del pending[name]
+                    future = submit(pool, stage)
+                    if future is None:
+                        done.add(name)
+                    else:
+                        running[future] = name
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    key, elapsed = future.result()
+                except Exception as e:
+                    print(f"Stage {name} failed: {e}")
+                    timings.append((name, 'failed', 0.0))
+                    failed.add(name)
+                    continue
+                # Fingerprint as of the start of the stage, so edits made meanwhile still trigger a rerun
+                state['stages'][name] = key
+                save_json(state_path, state)
+                timings.append((name, 'ran', elapsed))
+                done.add(name)
+
+    save_json(state_path, state)
+    print("\nStage                          Status       Seconds")
+    for name, status, elapsed in timings:
+        print(f"{name:<30} {status:<12} {elapsed:>7.1f}")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run download -> preprocess -> statistics -> index, skipping current stages.")
+    parser.add_argument('--force', nargs='*', default=[], help="Stage names to rerun regardless of fingerprints.")
+    parser.add_argument('--dry-run', action='store_true', help="Only report which stages would run.")
+    parser.add_argument('--workers', type=int, default=4, help="Stages run in parallel when independent.")
+    args = parser.parse_args()
+
+    ok = run_pipeline(build_stages(), force=set(args.force), dry_run=args.dry_run, workers=args.workers)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
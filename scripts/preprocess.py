@@ -1,13 +1,22 @@
 import pandas as pd
 import os
+import sys
 import numpy as np
 
-# Read CSV files
-california_df = pd.read_csv('data/RealEstate_California.csv')
-georgia_df = pd.read_csv('data/RealEstate_Georgia.csv')
+# Make the superlinked_app package importable when run as `python scripts/preprocess.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from superlinked_app.config import settings
+from superlinked_app.dtypes import align_categories, compact_dtypes, memory_report, read_dtypes
+from dedup import collapse_duplicates, print_report
+
+# Read CSV files, low-cardinality strings as categoricals from the start
+california_df = pd.read_csv('data/RealEstate_California.csv', dtype=read_dtypes(compact=True))
+georgia_df = pd.read_csv('data/RealEstate_Georgia.csv', dtype=read_dtypes(compact=True))
 
 # Merge
-combined_df = pd.concat([california_df, georgia_df], ignore_index=True)
+combined_df = pd.concat(align_categories([california_df, georgia_df]), ignore_index=True)
+del california_df, georgia_df
+memory_report(combined_df, "preprocess input")
 
 # Remove rows where description column is empty
 combined_df = combined_df.dropna(subset=['description'])
@@ -73,8 +82,18 @@ if 'datePostedString' in combined_df.columns and 'time' in combined_df.columns:
     combined_df = combined_df.dropna()
 
 # Normalize text-based columns to lowercase
-text_cols = combined_df.select_dtypes(include=['object']).columns
+text_cols = combined_df.select_dtypes(include=['object', 'category']).columns
 for col in text_cols:
+    if isinstance(combined_df[col].dtype, pd.CategoricalDtype):
+        # Normalize each category once instead of every row ('nan' matches astype(str) below)
+        if combined_df[col].isna().any():
+            combined_df[col] = combined_df[col].cat.add_categories('nan').fillna('nan')
+        categories = combined_df[col].cat.categories
+        normalized = categories.astype(str).str.lower()
+        if col == 'county':
+            normalized = normalized.str.replace(' county', '', regex=False)
+        combined_df[col] = combined_df[col].map(dict(zip(categories, normalized))).astype('category')
+        continue
     combined_df[col] = combined_df[col].astype(str).str.lower()
     if col == 'county':
         combined_df[col] = combined_df[col].str.replace(' county', '', regex=False)
@@ -135,14 +154,15 @@ def normalize_levels(level):
     return level
 
 if 'levels' in combined_df.columns:
-    combined_df['levels'] = combined_df['levels'].apply(normalize_levels)
+    # map() on a categorical normalizes each distinct level once
+    combined_df['levels'] = combined_df['levels'].map(normalize_levels).astype('category')
 
 # Fill missing numerical values with city median
 numeric_cols = combined_df.select_dtypes(include=[np.number]).columns
 exclude_cols = ['longitude', 'latitude', 'time', 'price']  # Exclude columns that shouldn't use median
 for col in numeric_cols:
     if col not in exclude_cols:
-        combined_df[col] = combined_df.groupby('city')[col].transform(lambda x: x.fillna(x.median()))
+        combined_df[col] = combined_df.groupby('city', observed=True)[col].transform(lambda x: x.fillna(x.median()))
 
 # Drop rows where price is 0 or null
 if 'price' in combined_df.columns:
@@ -154,7 +174,24 @@ if 'price' in combined_df.columns:
 # Remove duplicate rows based on id column
 combined_df = combined_df.drop_duplicates(subset=['id'])
 
+# Collapse repeated listings of the same home (one row per event) into one row with its event history
+combined_df, dedup_report = collapse_duplicates(combined_df)
+print_report(dedup_report)
+
+# Shrink dtypes before writing and splitting into shards
+compact_dtypes(combined_df)
+memory_report(combined_df, "preprocess output")
+
 # Save the new CSV file to data folder
 combined_df.to_csv('data/processed_real_estate.csv', index=False)
 
 print("Preprocessing completed. New file: data/processed_real_estate.csv")
+
+# Split into one file per shard so shards can be ingested independently
+if settings.shards:
+    os.makedirs(settings.path_shards, exist_ok=True)
+    for shard, states in settings.shards.items():
+        shard_df = combined_df[combined_df['state'].isin([state.lower() for state in states])]
+        shard_path = os.path.join(settings.path_shards, f"{shard}.csv")
+        shard_df.to_csv(shard_path, index=False)
+        print(f"Shard {shard} ({', '.join(states)}): {len(shard_df)} rows -> {shard_path}")
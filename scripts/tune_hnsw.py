@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+# Make the superlinked_app package importable when run as `python scripts/tune_hnsw.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from superlinked_app.config import settings
+from superlinked_app.qdrant import vector_name
+
+from loadtest import natural_queries
+
+# Collection size buckets the recommended settings are stored under
+SIZE_BUCKETS = [10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def sample_vectors(client, collection, using, limit):
+    """Scrolls up to limit stored vectors out of the live collection."""
+    vectors = []
+    offset = None
+    while len(vectors) < limit:
+        points, offset = client.scroll(
+            collection, limit=min(1024, limit - len(vectors)), offset=offset,
+            with_payload=False, with_vectors=True,
+        )
+        vectors.extend(point.vector[using] if using else point.vector for point in points)
+        if offset is None:
+            break
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def nlq_query_vectors(api_url, queries):
+    """Collects the search vectors Superlinked builds for natural queries (returned in result metadata)."""
+    vectors = []
+    for natural_query in queries:
+        request = urllib.request.Request(
+            f"{api_url}/api/v1/search/property",
+            data=json.dumps({'natural_query': natural_query, 'limit': 1}).encode(),
+            headers={'Content-Type': 'application/json', 'x-include-metadata': 'True'},
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=60) as response:
+            vector = json.loads(response.read()).get('metadata', {}).get('search_vector')
+        if vector:
+            vectors.append(vector)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def exact_neighbors(base, queries, k, distance):
+    """Brute-force ground truth: indices of the k nearest base vectors for every query."""
+    if distance == models.Distance.EUCLID:
+        scores = -(
+            (queries ** 2).sum(axis=1, keepdims=True) - 2 * queries @ base.T + (base ** 2).sum(axis=1)
+        )
+    else:
+        if distance == models.Distance.COSINE:
+            base = base / np.maximum(np.linalg.norm(base, axis=1, keepdims=True), 1e-12)
+            queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = queries @ base.T
+    top = np.argpartition(-scores, kth=min(k, base.shape[0] - 1), axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def estimated_index_mib(count, dim, m):
+    """Vectors plus HNSW links (layer 0 holds 2*m links per point, upper layers add about 1/m of that)."""
+    vector_bytes = count * dim * 4
+    link_bytes = count * 2 * m * 4 * (1 + 1 / max(m, 2))
+    return (vector_bytes + link_bytes) / 2**20
+
+
+def wait_until_indexed(client, collection, point_count, timeout=600):
+    """Waits until the HNSW graph covers every point; GREEN alone is reported before the optimizer has started."""
+    start = time.time()
+    while time.time() - start < timeout:
+        info = client.get_collection(collection)
+        if info.status == models.CollectionStatus.GREEN and (info.indexed_vectors_count or 0) >= point_count:
+            return
+        time.sleep(0.5)
+    raise TimeoutError(f"{collection} was not fully indexed after {timeout}s")
+
+
+def evaluate(client, base, queries, truth, distance, m, ef_construct, ef_values, k, indexed=True):
+    """Builds a scratch collection with the given HNSW settings and measures recall and latency per ef.
+
+    indexed=False skips waiting for the HNSW graph, for ':memory:' clients that never build one.
+    """
+    collection = f"hnsw_tune_m{m}_efc{ef_construct}"
+    if client.collection_exists(collection):
+        client.delete_collection(collection)
+    client.create_collection(
+        collection,
+        vectors_config=models.VectorParams(size=base.shape[1], distance=distance),
+        hnsw_config=models.HnswConfigDiff(m=m, ef_construct=ef_construct),
+        # Index right away instead of waiting for the default indexing threshold
+        optimizers_config=models.OptimizersConfigDiff(indexing_threshold=1),
+    )
+    build_start = time.perf_counter()
+    client.upload_collection(collection, vectors=base, ids=range(len(base)), wait=True)
+    if indexed:
+        wait_until_indexed(client, collection, len(base))
+    build_seconds = time.perf_counter() - build_start
+
+    results = []
+    for ef in ef_values:
+        latencies = []
+        hits = 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            points = client.query_points(
+                collection, query=query, limit=k,
+                search_params=models.SearchParams(hnsw_ef=ef),
+            ).points
+            latencies.append(time.perf_counter() - start)
+            hits += len(expected & {point.id for point in points})
+        results.append({
+            'm': m,
+            'ef_construct': ef_construct,
+            'ef': ef,
+            'recall': hits / (k * len(queries)),
+            'p50_ms': float(np.percentile(latencies, 50) * 1000),
+            'p95_ms': float(np.percentile(latencies, 95) * 1000),
+            'build_s': build_seconds,
+            'index_mib': estimated_index_mib(len(base), base.shape[1], m),
+        })
+        print(f"m={m:<3} ef_construct={ef_construct:<4} ef={ef:<4} recall@{k}={results[-1]['recall']:.3f} "
+              f"p95={results[-1]['p95_ms']:.2f}ms index~{results[-1]['index_mib']:.0f}MiB")
+    client.delete_collection(collection)
+    return results
+
+
+def recommend(results, min_recall):
+    """Fastest setting reaching min_recall, preferring smaller indexes on ties; best recall otherwise."""
+    good = [r for r in results if r['recall'] >= min_recall]
+    if good:
+        return min(good, key=lambda r: (round(r['p95_ms'], 1), r['index_mib']))
+    return max(results, key=lambda r: (r['recall'], -r['p95_ms']))
+
+
+def plot(results, path, k):
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed, skipping plot")
+        return
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for (m, ef_construct) in sorted({(r['m'], r['ef_construct']) for r in results}):
+        series = [r for r in results if r['m'] == m and r['ef_construct'] == ef_construct]
+        ax.plot([r['p95_ms'] for r in series], [r['recall'] for r in series], marker='o',
+                label=f"m={m}, ef_construct={ef_construct}")
+    ax.set_xlabel('p95 latency (ms)')
+    ax.set_ylabel(f'recall@{k}')
+    ax.legend(fontsize='small')
+    fig.savefig(path, bbox_inches='tight')
+    print(f"Plot saved to {path}")
+
+
+def save_profile(recommended, point_count):
+    """Stores the recommendation under the smallest size bucket holding point_count."""
+    bucket = next((size for size in SIZE_BUCKETS if point_count <= size), SIZE_BUCKETS[-1])
+    profiles = {}
+    if os.path.exists(settings.path_hnsw_profiles):
+        with open(settings.path_hnsw_profiles, 'r') as f:
+            profiles = json.load(f)
+    profiles[str(bucket)] = {key: recommended[key] for key in ['m', 'ef_construct', 'ef', 'recall', 'p95_ms']}
+    with open(settings.path_hnsw_profiles, 'w') as f:
+        json.dump(profiles, f, indent=4)
+    print(f"Recommended settings for collections up to {bucket} points saved to {settings.path_hnsw_profiles}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep HNSW parameters and record recall vs latency.")
+    parser.add_argument('--qdrant-url', default=settings.qdrant_url,
+                        help="Qdrant holding the live collection and scratch collections (':memory:' runs in-process).")
+    parser.add_argument('--collection', default=settings.qdrant_collection)
+    parser.add_argument('--vectors', help="Load base vectors from a .npy file instead of the live collection.")
+    parser.add_argument('--api-url', help="Superlinked server to collect natural query vectors from.")
+    parser.add_argument('--sample-size', type=int, default=20000, help="Base vectors to sample.")
+    parser.add_argument('--queries', type=int, default=200, help="Stored vectors held out as similar_query queries.")
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--m', type=int, nargs='+', default=[8, 16, 32])
+    parser.add_argument('--ef-construct', type=int, nargs='+', default=[64, 128, 256])
+    parser.add_argument('--ef', type=int, nargs='+', default=[16, 32, 64, 128, 256])
+    parser.add_argument('--min-recall', type=float, default=0.95)
+    parser.add_argument('--output', default='data/hnsw_sweep.json')
+    parser.add_argument('--apply', action='store_true', help="Also set m/ef_construct on the live collection.")
+    args = parser.parse_args()
+    # Local mode searches by brute force, so its numbers say nothing about HNSW settings
+    in_memory = args.qdrant_url == ':memory:'
+    if in_memory and args.apply:
+        parser.error("--apply needs a Qdrant server, ':memory:' has no HNSW index to tune")
+
+    client = QdrantClient(location=':memory:') if in_memory else \
+        QdrantClient(url=args.qdrant_url, api_key=settings.qdrant_api_key or None)
+
+    if args.vectors:
+        vectors = np.load(args.vectors).astype(np.float32)
+        distance = models.Distance.COSINE
+    else:
+        info = client.get_collection(args.collection)
+        using = vector_name(client, args.collection)
+        params = info.config.params.vectors[using] if using else info.config.params.vectors
+        distance = params.distance
+        vectors = sample_vectors(client, args.collection, using, args.sample_size + args.queries)
+
+    # Held-out stored vectors are exactly what similar_query searches with
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(vectors))
+    queries = vectors[order[:args.queries]]
+    base = vectors[order[args.queries:]]
+    if args.api_url:
+        nlq_vectors = nlq_query_vectors(args.api_url, natural_queries)
+        if len(nlq_vectors):
+            queries = np.vstack([queries, nlq_vectors])
+    print(f"{len(base)} base vectors, {len(queries)} queries, dim {base.shape[1]}, {distance}")
+
+    truth = exact_neighbors(base, queries, args.k, distance)
+    results = []
+    for m in args.m:
+        for ef_construct in args.ef_construct:
+            results.extend(evaluate(
+                client, base, queries, truth, distance, m, ef_construct, args.ef, args.k, indexed=not in_memory,
+            ))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+    plot(results, os.path.splitext(args.output)[0] + '.png', args.k)
+
+    recommended = recommend(results, args.min_recall)
+    print(f"Recommended: m={recommended['m']} ef_construct={recommended['ef_construct']} ef={recommended['ef']} "
+          f"(recall@{args.k}={recommended['recall']:.3f}, p95={recommended['p95_ms']:.2f}ms)")
+    if in_memory:
+        print(f"':memory:' run, results only written to {args.output}")
+    else:
+        # The sweep measured an index over the sampled base, so that is the size the numbers hold for
+        save_profile(recommended, len(base))
+
+    if args.apply and not args.vectors:
+        client.update_collection(
+            args.collection,
+            hnsw_config=models.HnswConfigDiff(m=recommended['m'], ef_construct=recommended['ef_construct']),
+        )
+        print(f"Applied m/ef_construct to {args.collection}; Qdrant rebuilds the index in the background")
+
+
+if __name__ == "__main__":
+    main()
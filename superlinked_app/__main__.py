@@ -0,0 +1,32 @@
+import logging
+
+import uvicorn
+from superlinked.server.configuration.settings import settings as server_settings
+from superlinked.server.logger import ServerLoggerConfigurator
+
+
+def main():
+    """Starts the server the way superlinked.server.__main__ does, with create_app as the factory.
+
+    Lives in the package's __main__ because worker processes are spawned, and spawn re-imports any other main
+    module before the worker answers the supervisor's ping; importing Superlinked takes longer than that.
+    """
+    ServerLoggerConfigurator.setup_logger()
+    if server_settings.WORKER_COUNT > 1:
+        logging.getLogger(__name__).warning(
+            "WORKER_COUNT=%d: pagination cursors and game tokens are kept per worker, /api/v1/cursor/next and "
+            "/api/v1/game/guess only find those created by the worker they land on", server_settings.WORKER_COUNT,
+        )
+    uvicorn.run(
+        "superlinked_app.server:create_app",
+        host=server_settings.SERVER_HOST,
+        port=server_settings.SERVER_PORT,
+        workers=server_settings.WORKER_COUNT,
+        log_config=None,
+        factory=True,
+        loop="asyncio",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ import pandas as pd
 from superlinked_app.index import index, real_estate_schema
 from superlinked_app.query import query, similar_query, debug_query
 from superlinked_app.config import settings
+from superlinked_app.dtypes import read_dtypes
+from superlinked_app.sharding import hosted_datasets
 
 # Setup the executor
 rest_source = sl.RestSource(real_estate_schema)
@@ -15,20 +17,27 @@ vector_database = sl.QdrantVectorDatabase(
     prefer_grpc=True
 )
 
-config = sl.DataLoaderConfig(
-    path=settings.path_dataset,
-    format=sl.DataFormat.CSV,
-    name="properties",
-    pandas_read_kwargs={
-        "chunksize": settings.chunk_size,
-    },
-)
-loader_source = sl.DataLoaderSource(real_estate_schema, config)
+
+def data_loader_source(name, path):
+    config = sl.DataLoaderConfig(
+        path=path,
+        format=sl.DataFormat.CSV,
+        name=name,
+        pandas_read_kwargs={
+            "chunksize": settings.chunk_size,
+            "dtype": read_dtypes(),
+        },
+    )
+    return sl.DataLoaderSource(real_estate_schema, config)
+
+
+# One loader per shard so each shard can be ingested on its own via /data-loader/properties_<shard>/run
+loader_sources = [data_loader_source(name, path) for name, path in hosted_datasets()]
 
 executor = sl.RestExecutor(
     sources=[
         rest_source,
-        loader_source,
+        *loader_sources,
     ],
     indices=[index],
     queries=[
@@ -0,0 +1,314 @@
+import asyncio
+import csv
+import io
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+
+import httpx
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from superlinked_app.config import settings
+from superlinked_app.dtypes import read_dtypes
+from superlinked_app.facets import INGEST_PATH, facet_index
+from superlinked_app.qdrant import delete_points, get_client
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/bulk-ingest")
+
+FORMATS = ("ndjson", "csv")
+# Error rows returned in the response; the count covers all of them
+MAX_REPORTED_ERRORS = 1000
+# A quoted CSV field still open after this many lines or characters is taken to be an unbalanced quote
+MAX_RECORD_LINES = 100
+MAX_RECORD_CHARS = 64 * 1024
+# Longer lines are skipped rather than buffered, and reported as error rows
+MAX_LINE_BYTES = 64 * 1024
+
+
+@dataclass
+class Progress:
+    batches: list
+    errors: list
+    rows: int = 0
+    ingested: int = 0
+    error_count: int = 0
+
+    def fail(self, line, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+
+def decode(line):
+    return line.decode("utf-8", errors="replace").rstrip("\r")
+
+
+async def lines(stream):
+    """(line number, text) for every line of a chunked body, without holding more than one line in memory.
+
+    Only the new chunk is scanned for line ends. A line longer than MAX_LINE_BYTES is dropped up to its end
+    and yielded with text None, for the parsers to report as an error row.
+    """
+    parts, size, oversized = [], 0, False
+    number = 0
+    async for chunk in stream:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            number += 1
+            if oversized or size + end - start > MAX_LINE_BYTES:
+                yield number, None
+            else:
+                parts.append(chunk[start:end])
+                yield number, decode(b"".join(parts))
+            parts, size, oversized = [], 0, False
+            start = end + 1
+        if not oversized:
+            size += len(chunk) - start
+            if size > MAX_LINE_BYTES:
+                parts, oversized = [], True
+            else:
+                parts.append(chunk[start:])
+    if oversized:
+        yield number + 1, None
+    elif b"".join(parts).strip():
+        yield number + 1, decode(b"".join(parts))
+
+
+async def ndjson_records(stream):
+    async for number, line in lines(stream):
+        if line is None or line.strip():
+            yield number, line
+
+
+async def csv_records(stream):
+    """CSV records as raw text; quoted fields such as descriptions may span several lines.
+
+    A record still open past MAX_RECORD_LINES or MAX_RECORD_CHARS, or at an oversized line, has an unbalanced
+    quote: its first line is passed on alone, to be reported as an error row by parse_csv, and reading resumes
+    at the line after it. Oversized lines are passed on as None.
+    """
+    source = lines(stream).__aiter__()
+    replay = deque()
+    pending, quotes, chars = [], 0, 0
+    while True:
+        if replay:
+            number, line = replay.popleft()
+        else:
+            try:
+                number, line = await source.__anext__()
+            except StopAsyncIteration:
+                break
+        if line is None:
+            if pending:
+                (start, first), *rest = pending
+                yield start, first
+                replay.extendleft(reversed([*rest, (number, line)]))
+                pending, quotes, chars = [], 0, 0
+            else:
+                yield number, None
+            continue
+        pending.append((number, line))
+        quotes += line.count('"')
+        chars += len(line)
+        if quotes % 2 == 0:
+            text = "\n".join(part for _, part in pending)
+            if text.strip():
+                yield pending[0][0], text
+            pending, quotes, chars = [], 0, 0
+        elif len(pending) > MAX_RECORD_LINES or chars > MAX_RECORD_CHARS:
+            (start, first), *rest = pending
+            yield start, first
+            replay.extendleft(reversed(rest))
+            pending, quotes, chars = [], 0, 0
+    if pending:
+        # Unterminated quote at the end of the body, reported as an error row by parse_csv
+        yield pending[0][0], "\n".join(part for _, part in pending)
+
+
+def parse_ndjson(batch, errors):
+    rows = []
+    for line, text in batch:
+        if text is None:
+            errors.append((line, f"line longer than {MAX_LINE_BYTES} bytes"))
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as e:
+            errors.append((line, f"invalid JSON: {e}"))
+            continue
+        if not isinstance(record, dict) or "id" not in record:
+            errors.append((line, "expected a JSON object with an id"))
+            continue
+        rows.append((line, record))
+    return rows
+
+
+def parse_csv(header, batch, errors):
+    """Parses a batch with the same dtypes as the data loader, so records match what it would ingest."""
+    width = len(next(csv.reader([header])))
+    valid = []
+    for line, text in batch:
+        if text is None:
+            errors.append((line, f"line longer than {MAX_LINE_BYTES} bytes"))
+            continue
+        if text.count('"') % 2:
+            errors.append((line, "unbalanced quote"))
+            continue
+        fields = next(csv.reader(io.StringIO(text)), [])
+        if len(fields) != width:
+            errors.append((line, f"expected {width} fields, got {len(fields)}"))
+            continue
+        valid.append((line, text))
+    if not valid:
+        return []
+    df = pd.read_csv(io.StringIO("\n".join([header, *(text for _, text in valid)])), dtype=read_dtypes())
+    records = json.loads(df.to_json(orient="records"))
+    return [(line, record) for (line, _), record in zip(valid, records)]
+
+
+async def post_batch(client, rows):
+    """Posts rows to the REST source; returns None when accepted, else (status code or None, error)."""
+    try:
+        response = await client.post(INGEST_PATH, json=[record for _, record in rows])
+    except httpx.HTTPError as e:
+        return None, f"ingest request failed: {e!r}"
+    if response.status_code < 400:
+        return None
+    return response.status_code, f"HTTP {response.status_code}: {response.text[:200]}"
+
+
+async def post_rows(client, rows, errors, failure=None):
+    """Ingests rows; a rejected batch is split in halves until the offending rows are found.
+
+    failure is the outcome of posting rows already, when the caller has done so. Halves that are both rejected
+    the same way point at a cause that is not in particular rows, so all of them are reported with it.
+    """
+    failure = failure or await post_batch(client, rows)
+    if failure is None:
+        return len(rows)
+    status, error = failure
+    if status is not None and 400 <= status < 500 and len(rows) > 1:
+        middle = len(rows) // 2
+        halves = [rows[:middle], rows[middle:]]
+        failures = [await post_batch(client, half) for half in halves]
+        if failures[0] is None or failures[0] != failures[1]:
+            return sum([
+                await post_rows(client, half, errors, half_failure) if half_failure else len(half)
+                for half, half_failure in zip(halves, failures)
+            ])
+    errors.extend((line, error) for line, _ in rows)
+    return 0
+
+
+async def consume(queue, client, parse, progress):
+    while (batch := await queue.get()) is not None:
+        start = time.perf_counter()
+        errors = []
+        try:
+            rows = await run_in_threadpool(parse, batch, errors)
+        except ValueError as e:
+            # e.g. text in a numeric column; the worker must keep draining the queue
+            errors.extend((line, f"batch could not be parsed: {e}") for line, _ in batch)
+            rows = []
+        ingested = await post_rows(client, rows, errors) if rows else 0
+        progress.ingested += ingested
+        for line, error in errors:
+            progress.fail(line, error)
+        progress.batches.append({
+            "first_line": batch[0][0],
+            "rows": len(batch),
+            "ingested": ingested,
+            "errors": len(errors),
+            "took_ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+        logger.info("Bulk ingest: %d rows read, %d ingested, %d errors", progress.rows, progress.ingested, progress.error_count)
+
+
+async def produce(records, queue, progress, workers):
+    """Groups records into chunk_size batches; a full queue stops reading the body until workers catch up."""
+    batch = []
+    async for record in records:
+        batch.append(record)
+        progress.rows += 1
+        if len(batch) >= settings.chunk_size:
+            await queue.put(batch)
+            batch = []
+    if batch:
+        await queue.put(batch)
+    for _ in range(workers):
+        await queue.put(None)
+
+
+@router.post("/real_estate")
+async def bulk_ingest(request: Request, format: str = ""):
+    """Streams NDJSON or CSV listings (a header row first) into the REST source in chunk_size micro-batches.
+
+    The format comes from ?format= or the Content-Type header. Returns per-batch progress and the rejected rows.
+    """
+    format = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    if format not in FORMATS:
+        raise HTTPException(status_code=422, detail=f"format must be one of {', '.join(FORMATS)}.")
+
+    started = time.perf_counter()
+    progress = Progress(batches=[], errors=[])
+    if format == "csv":
+        records = csv_records(request.stream())
+        try:
+            _, header = await records.__anext__()
+        except StopAsyncIteration:
+            raise HTTPException(status_code=422, detail="CSV body has no header row.")
+        if header is None:
+            raise HTTPException(status_code=422, detail=f"CSV header is longer than {MAX_LINE_BYTES} bytes.")
+        parse = partial(parse_csv, header)
+    else:
+        records = ndjson_records(request.stream())
+        parse = parse_ndjson
+
+    workers = settings.bulk_ingest_workers
+    queue = asyncio.Queue(maxsize=settings.bulk_ingest_queue_batches)
+    async with httpx.AsyncClient(base_url=settings.superlinked_url, timeout=settings.bulk_ingest_timeout) as client:
+        tasks = [
+            asyncio.ensure_future(produce(records, queue, progress, workers)),
+            *[asyncio.ensure_future(consume(queue, client, parse, progress)) for _ in range(workers)],
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            logger.exception("Bulk ingest failed after %d rows", progress.rows)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Bulk ingest failed after {progress.rows} rows read, {progress.ingested} ingested: {e!r}",
+            )
+        finally:
+            # A failed worker would otherwise leave the reader blocked on a full queue and the rest still posting
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "format": format,
+        "rows": progress.rows,
+        "ingested": progress.ingested,
+        "error_count": progress.error_count,
+        "took_s": round(time.perf_counter() - started, 2),
+        "batches": sorted(progress.batches, key=lambda batch: batch["first_line"]),
+        "errors": sorted(progress.errors, key=lambda error: error["line"]),
+    }
+
+
+@router.post("/real_estate/delete")
+async def bulk_delete(request: Request):
+    """Deletes listings from this node's collection and facet index: {"ids": ["...", ...]}."""
+    body = await request.json()
+    ids = [str(property_id) for property_id in body.get("ids") or []]
+    if ids:
+        await run_in_threadpool(delete_points, get_client(), settings.qdrant_collection, ids)
+        await run_in_threadpool(facet_index.remove_ids, ids)
+    return {"deleted": len(ids)}
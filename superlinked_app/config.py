@@ -25,7 +25,50 @@ class Settings(BaseSettings):
     # Qdrant vector database
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: str = ""
-    
+    # Collection Superlinked writes to, used by routes that query Qdrant directly
+    qdrant_collection: str = "default"
+    # Tuned HNSW settings per collection size, written by scripts/tune_hnsw.py
+    path_hnsw_profiles: str = "data/hnsw_profiles.json"
+
+    # Superlinked server this process talks to for in-process routes
+    superlinked_url: str = "http://localhost:8080"
+
+    # Sharding by state: shard name -> list of state codes, e.g. {"west": ["ca"], "south": ["ga", "fl"]}
+    # Empty means a single unsharded collection.
+    shards: dict[str, list[str]] = {}
+    # Shard hosted by this node; empty hosts every configured shard
+    shard_name: str = ""
+    # Shard name -> base URL of the Superlinked server hosting it
+    shard_urls: dict[str, str] = {}
+    path_shards: str = "data/shards"
+    shard_timeout: float = 30.0
+
+    # Pagination cursors: how long a cursor lives and how many are kept at most
+    cursor_ttl_seconds: int = 300
+    cursor_max_entries: int = 1000
+
+    # Game tokens issued by /game/target: how long a game can take and how many are open at most
+    game_ttl_seconds: int = 3600
+    game_max_entries: int = 10000
+
+    # Seconds between rebuilds of each worker's facet index from Qdrant, 0 only loads it at startup
+    facet_refresh_seconds: float = 300.0
+
+    # Timeout of one REST ingest batch sent by scripts/pipeline.py
+    ingest_timeout: float = 300.0
+
+    # Bulk ingestion: batches waiting for a worker before reading of the request body pauses,
+    # workers sending batches to the REST source in parallel, and the timeout of one batch
+    bulk_ingest_queue_batches: int = 4
+    bulk_ingest_workers: int = 2
+    bulk_ingest_timeout: float = 300.0
+
+    # On-demand request profiling: requests carrying 'x-profile: <profiling_secret>' are sampled
+    profiling_enabled: bool = False
+    profiling_secret: SecretStr = SecretStr("")
+    profiling_interval: float = 0.001
+    path_profiles: str = "data/profiles"
+
     model_config = SettingsConfigDict(
         env_file=DEFAULT_ENV_FILENAME, env_file_encoding="utf-8"
     )
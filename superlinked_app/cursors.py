@@ -0,0 +1,151 @@
+import asyncio
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import httpx
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from superlinked_app.config import settings
+from superlinked_app.filters import qdrant_filter
+from superlinked_app.qdrant import to_entry, vector_search
+
+router = APIRouter(prefix="/api/v1/cursor")
+
+
+@dataclass
+class CursorEntry:
+    """What a follow-up page needs: the parsed params, the query vector and where the last page ended."""
+
+    search_params: dict
+    vector: np.ndarray
+    offset: int
+    last_score: float
+    last_ids: set
+    expires_at: float
+    # Held from reading the position to storing the next one, so concurrent /next calls get consecutive pages
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+class CursorStore:
+    """Bounded LRU of entries with an expires_at, evicted by TTL.
+
+    Entries live in the memory of the worker that created them, so cursors and game tokens need
+    WORKER_COUNT=1 (or routing that sends a client back to the same worker).
+    """
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _evict(self, now):
+        while self.entries and next(iter(self.entries.values())).expires_at <= now:
+            self.entries.popitem(last=False)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def put(self, entry, token=None):
+        """Stores entry under token (a new one if not given) and refreshes its TTL."""
+        token = token or secrets.token_urlsafe(16)
+        now = time.monotonic()
+        entry.expires_at = now + self.ttl_seconds
+        with self.lock:
+            self.entries[token] = entry
+            self.entries.move_to_end(token)
+            self._evict(now)
+        return token
+
+    def get(self, token):
+        now = time.monotonic()
+        with self.lock:
+            self._evict(now)
+            return self.entries.get(token)
+
+    def pop(self, token):
+        now = time.monotonic()
+        with self.lock:
+            self._evict(now)
+            return self.entries.pop(token, None)
+
+
+cursor_store = CursorStore(settings.cursor_max_entries, settings.cursor_ttl_seconds)
+
+
+def entry_score(entry):
+    return entry.get("metadata", {}).get("score", 0.0)
+
+
+def next_page(entry, limit):
+    """Plain vector search from where the previous page stopped; no NLQ call and no embedding."""
+    points = vector_search(entry.vector, qdrant_filter(entry.search_params), limit, offset=entry.offset)
+    # Index updates between pages can shift offsets; never repeat the previous page or rank above its tail
+    results = [to_entry(point) for point in points if point.score <= entry.last_score]
+    results = [result for result in results if result["id"] not in entry.last_ids]
+    return results, len(points)
+
+
+@router.post("/search/{descriptor}")
+async def cursor_search(descriptor: str, request: Request):
+    """Runs /api/v1/search/{descriptor} and returns its result plus a cursor for the following pages."""
+    payload = await request.json()
+    async with httpx.AsyncClient(timeout=settings.shard_timeout) as client:
+        response = await client.post(
+            f"{settings.superlinked_url.rstrip('/')}/api/v1/search/{descriptor}",
+            json=payload,
+            headers={"x-include-metadata": "True"},
+        )
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    result = response.json()
+
+    entries = result.get("entries", [])
+    metadata = result.get("metadata", {})
+    vector = metadata.get("search_vector")
+    limit = int(payload.get("limit", 10))
+    result["cursor"] = None
+    if vector is not None and len(entries) >= limit:
+        # search_params holds the parameters after NLQ extraction, so later pages need no LLM call
+        search_params = {**payload, **(metadata.get("search_params") or {})}
+        result["cursor"] = cursor_store.put(CursorEntry(
+            search_params=search_params,
+            vector=np.asarray(vector, dtype=np.float32),
+            offset=len(entries),
+            last_score=entry_score(entries[-1]),
+            last_ids={str(e.get("id")) for e in entries},
+            expires_at=0.0,
+        ))
+    return result
+
+
+@router.post("/next")
+async def cursor_next(request: Request):
+    """Returns the next page for a cursor: {"cursor": "...", "limit": 30}."""
+    body = await request.json()
+    token = body.get("cursor")
+    entry = cursor_store.get(token)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Cursor expired or unknown, repeat the search.")
+    async with entry.lock:
+        # A concurrent call may have reached the last page while this one waited
+        if cursor_store.get(token) is not entry:
+            raise HTTPException(status_code=404, detail="Cursor expired or unknown, repeat the search.")
+        limit = int(body.get("limit", entry.search_params.get("limit", 10)))
+
+        results, fetched = await run_in_threadpool(next_page, entry, limit)
+        entry.offset += fetched
+        if results:
+            entry.last_score = entry_score(results[-1])
+            entry.last_ids = {result["id"] for result in results}
+
+        if fetched < limit:
+            cursor_store.pop(token)
+            token = None
+        else:
+            cursor_store.put(entry, token)
+    return {"entries": results, "cursor": token}
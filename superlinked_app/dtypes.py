@@ -0,0 +1,99 @@
+import resource
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Dtype plan shared by scripts/preprocess.py, scripts/generate_statistics.py and the data loader.
+
+# Low-cardinality strings are stored once per category instead of once per row
+CATEGORICAL_COLUMNS = [
+    "city", "county", "state", "homeType", "event", "levels", "currency", "country", "lotAreaUnits",
+]
+
+# 0/1 flags
+FLAG_COLUMNS = [
+    "is_bankOwned", "is_forAuction", "parking", "hasGarage", "pool", "spa", "isNewConstruction", "hasPetsAllowed",
+]
+
+# Small counts and ids, with the narrowest integer type that holds the dataset's values
+COUNT_COLUMNS = {
+    "bedrooms": "int16",
+    "bathrooms": "int16",
+    "garageSpaces": "int16",
+    "yearBuilt": "int16",
+    "stateId": "int16",
+    "countyId": "int32",
+    "cityId": "int32",
+    "zipcode": "int32",
+    "livingArea": "int32",
+    "buildingArea": "int32",
+}
+
+# float32 keeps ~7 significant digits, about a meter at these longitudes. Only for frames held in memory:
+# ingested records are read as float64, or Superlinked stores float32 artifacts (34.46707 -> 34.467071533203125)
+COORDINATE_COLUMNS = ["longitude", "latitude"]
+
+NULLABLE_INTEGERS = {"int8": "Int8", "int16": "Int16", "int32": "Int32"}
+
+
+def read_dtypes(compact=False):
+    """Returns dtypes that are always safe to request from pd.read_csv; compact=True adds float32 coordinates."""
+    dtypes = {col: "category" for col in CATEGORICAL_COLUMNS}
+    if compact:
+        dtypes.update({col: "float32" for col in COORDINATE_COLUMNS})
+    return dtypes
+
+
+def _downcast_integer(series, dtype):
+    """Returns series as dtype if every value is integral and in range, otherwise unchanged."""
+    values = series.dropna()
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return series
+    info = np.iinfo(dtype)
+    if len(values) and ((values % 1 != 0).any() or values.min() < info.min or values.max() > info.max):
+        return series
+    if series.isna().any():
+        return series.astype(NULLABLE_INTEGERS[dtype])
+    return series.astype(dtype)
+
+
+def compact_dtypes(df):
+    """Converts df in place to the dtype plan and returns it."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col in FLAG_COLUMNS:
+        if col in df.columns:
+            df[col] = _downcast_integer(df[col], "int8")
+    for col, dtype in COUNT_COLUMNS.items():
+        if col in df.columns:
+            df[col] = _downcast_integer(df[col], dtype)
+    for col in COORDINATE_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    return df
+
+
+def align_categories(frames):
+    """Gives categorical columns the same categories in every frame so pd.concat keeps them categorical."""
+    for col in CATEGORICAL_COLUMNS:
+        present = [f for f in frames if col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype)]
+        if len(present) > 1:
+            categories = union_categoricals([f[col] for f in present]).categories
+            for f in present:
+                f[col] = f[col].cat.set_categories(categories)
+    return frames
+
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB on Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def memory_report(df, label):
+    """Prints the frame's deep memory usage and the process peak RSS."""
+    usage = df.memory_usage(deep=True).sum() / 2**20
+    print(f"[memory] {label}: {len(df)} rows, {usage:.1f} MiB in frame, peak RSS {peak_rss_mib():.1f} MiB")
@@ -0,0 +1,343 @@
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Request
+from pyroaring import BitMap
+from starlette.concurrency import run_in_threadpool
+
+from superlinked_app.config import settings
+from superlinked_app.dtypes import read_dtypes
+from superlinked_app.filters import FILTER_PARAMS
+from superlinked_app.qdrant import ENTITY_ID_PREFIX, ORIGINAL_ID_FIELD, PAYLOAD_FIELD_PREFIX, get_client, payload_field
+from superlinked_app.sharding import hosted_datasets
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1")
+
+# Facets counted per value, matching FILTER_OPTIONS in frontend/src/app/game/utils.ts
+CATEGORICAL_FACETS = ["state", "homeType", "event", "levels"]
+FLAG_FACETS = ["is_bankOwned", "is_forAuction", "parking", "hasGarage", "pool", "spa", "isNewConstruction", "hasPetsAllowed"]
+# Indexed for filtering only, too many values to be worth counting
+FILTER_ONLY_FIELDS = ["city", "county"]
+
+# Bucket edges for range facets, each bucket is [edge, next edge)
+RANGE_BUCKETS = {
+    "price": [0, 100_000, 200_000, 300_000, 400_000, 500_000, 750_000, 1_000_000, 2_000_000, 5_000_000, np.inf],
+    "bedrooms": [0, 1, 2, 3, 4, 5, 6, np.inf],
+    "bathrooms": [0, 1, 2, 3, 4, 5, 6, np.inf],
+    "livingArea": [0, 500, 1000, 1500, 2000, 2500, 3000, 4000, 5000, np.inf],
+}
+
+INGEST_PATH = "/api/v1/ingest/real_estate"
+DATA_LOADER_PREFIX = "/data-loader/"
+
+
+def value_key(value):
+    """Bitmap key of a filter value; booleans and whole floats match the 0/1 and integer keys of numeric columns."""
+    if isinstance(value, (bool, np.bool_)):
+        return str(int(value))
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).lower()
+
+
+class BitMapValues:
+    """One bitmap per distinct value of a field."""
+
+    def __init__(self):
+        self.bitmaps = {}
+
+    def add(self, column, rows):
+        keys = column.astype(str).str.lower().to_numpy() if not pd.api.types.is_numeric_dtype(column) \
+            else pd.to_numeric(column, errors="coerce").fillna(-1).astype(np.int64).astype(str).to_numpy()
+        for key in np.unique(keys):
+            self.bitmaps.setdefault(key, BitMap()).update(rows[keys == key])
+
+    def rows_for(self, values):
+        return BitMap.union(*[self.bitmaps.get(value_key(value), BitMap()) for value in values]) \
+            if values else BitMap()
+
+
+class FacetIndex:
+    """Compressed bitmap indexes over the filterable fields, one bit per ingested row."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = BitMap()
+        self.next_row = 0
+        self.row_of_id = {}
+        self.values = {field: BitMapValues() for field in CATEGORICAL_FACETS + FLAG_FACETS + FILTER_ONLY_FIELDS}
+        self.buckets = {field: [BitMap() for _ in edges[:-1]] for field, edges in RANGE_BUCKETS.items()}
+        # Raw values of range fields by row, to resolve the partially covered edge buckets exactly
+        self.range_values = {field: np.empty(0, dtype=np.float64) for field in RANGE_BUCKETS}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _all_bitmaps(self):
+        for values in self.values.values():
+            yield from values.bitmaps.values()
+        for buckets in self.buckets.values():
+            yield from buckets
+
+    def add_frame(self, df):
+        """Adds rows; an id seen before keeps its row number, which is cleared and rewritten."""
+        if df.empty or "id" not in df.columns:
+            return
+        # Later rows win when a batch repeats an id
+        df = df.drop_duplicates(subset=["id"], keep="last")
+        ids = df["id"].astype(str).tolist()
+        with self.lock:
+            # Reusing rows keeps data loader reruns from growing the index and range_values
+            known = [self.row_of_id.get(row_id) for row_id in ids]
+            new_rows = iter(range(self.next_row, self.next_row + known.count(None)))
+            rows = np.fromiter((row if row is not None else next(new_rows) for row in known),
+                               dtype=np.uint32, count=len(ids))
+            self.next_row += known.count(None)
+
+            stale = BitMap(row for row in known if row is not None)
+            if stale:
+                for bitmap in self._all_bitmaps():
+                    bitmap.difference_update(stale)
+                self.rows.difference_update(stale)
+
+            for field, values in self.values.items():
+                if field in df.columns:
+                    values.add(df[field], rows)
+            for field, edges in RANGE_BUCKETS.items():
+                column = pd.to_numeric(df[field], errors="coerce").to_numpy(dtype=np.float64) \
+                    if field in df.columns else np.full(len(df), np.nan)
+                stored = self.range_values[field]
+                if len(stored) < self.next_row:
+                    grown = np.full(max(self.next_row, 2 * len(stored)), np.nan)
+                    grown[:len(stored)] = stored
+                    self.range_values[field] = stored = grown
+                stored[rows] = column
+                positions = np.searchsorted(edges, column, side="right") - 1
+                for bucket in np.unique(positions[~np.isnan(column)]):
+                    if 0 <= bucket < len(edges) - 1:
+                        self.buckets[field][bucket].update(rows[positions == bucket])
+
+            self.rows.update(rows)
+            self.row_of_id.update(zip(ids, rows.tolist()))
+
+    def replace(self, other):
+        """Takes over the rows of another index, so a rebuild swaps in at once under the existing object."""
+        with self.lock, other.lock:
+            self.rows, self.next_row, self.row_of_id = other.rows, other.next_row, other.row_of_id
+            self.values, self.buckets, self.range_values = other.values, other.buckets, other.range_values
+
+    def remove_ids(self, ids):
+        with self.lock:
+            stale = BitMap(self.row_of_id.pop(str(row_id)) for row_id in ids if str(row_id) in self.row_of_id)
+            for bitmap in self._all_bitmaps():
+                bitmap.difference_update(stale)
+            self.rows.difference_update(stale)
+
+    def add_records(self, records):
+        self.add_frame(pd.DataFrame.from_records(records))
+
+    def load_csv(self, path, chunk_size):
+        for chunk in pd.read_csv(path, dtype=read_dtypes(), chunksize=chunk_size):
+            self.add_frame(chunk)
+
+    def load_collection(self, client, collection, chunk_size):
+        """Indexes what is already stored in Qdrant, reading only the payload fields the facets use."""
+        fields = CATEGORICAL_FACETS + FLAG_FACETS + FILTER_ONLY_FIELDS + list(RANGE_BUCKETS)
+        keys = [ORIGINAL_ID_FIELD] + [payload_field(field) for field in fields]
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection, limit=chunk_size, offset=offset, with_payload=keys, with_vectors=False,
+            )
+            self.add_records([
+                {
+                    "id": str(point.payload.get(ORIGINAL_ID_FIELD, "")).removeprefix(ENTITY_ID_PREFIX),
+                    **{key[len(PAYLOAD_FIELD_PREFIX):]: value for key, value in point.payload.items()
+                       if key.startswith(PAYLOAD_FIELD_PREFIX)},
+                }
+                for point in points if point.payload
+            ])
+            if offset is None:
+                break
+
+    def _range_rows(self, field, low, high):
+        """Rows with low <= value <= high: whole buckets from bitmaps, edge buckets checked against raw values."""
+        edges = RANGE_BUCKETS[field]
+        low = -np.inf if low is None else float(low)
+        high = np.inf if high is None else float(high)
+        result = BitMap()
+        for bucket, bitmap in enumerate(self.buckets[field]):
+            bucket_low, bucket_high = edges[bucket], edges[bucket + 1]
+            if bucket_high <= low or bucket_low > high:
+                continue
+            if low <= bucket_low and bucket_high <= high:
+                result |= bitmap
+            else:
+                rows = np.fromiter(bitmap, dtype=np.uint32, count=len(bitmap))
+                values = self.range_values[field][rows]
+                result.update(rows[(values >= low) & (values <= high)])
+        return result
+
+    def _filter_rows(self, field, spec):
+        """Rows matching every active filter on one field."""
+        if spec["kind"] == "range":
+            return self._range_rows(field, spec["low"], spec["high"])
+        return self.values[field].rows_for(spec["values"])
+
+    def counts(self, params):
+        """Facet counts under the given search params; each facet ignores its own filter (multi-select)."""
+        active = parse_filters(params)
+        with self.lock:
+            matched = {field: self._filter_rows(field, spec) for field, spec in active.items()}
+
+            def base_without(excluded):
+                rows = BitMap(self.rows)
+                for field, field_rows in matched.items():
+                    if field != excluded:
+                        rows &= field_rows
+                return rows
+
+            facets = {}
+            for field in CATEGORICAL_FACETS + FLAG_FACETS:
+                base = base_without(field)
+                counts = {
+                    value: base.intersection_cardinality(bitmap)
+                    for value, bitmap in self.values[field].bitmaps.items()
+                }
+                facets[field] = {value: count for value, count in counts.items() if count}
+            for field, edges in RANGE_BUCKETS.items():
+                base = base_without(field)
+                facets[field] = [
+                    {"min": edges[i], "max": None if np.isinf(edges[i + 1]) else edges[i + 1],
+                     "count": base.intersection_cardinality(bitmap)}
+                    for i, bitmap in enumerate(self.buckets[field])
+                ]
+            return {"total": len(base_without(None)), "facets": facets}
+
+
+def parse_filters(params):
+    """Groups the active search filter params by field, so facets accept the same params as searches."""
+    active = {}
+    for param_name, value in params.items():
+        if param_name not in FILTER_PARAMS or value is None or value == "" or value == []:
+            continue
+        field, operator = FILTER_PARAMS[param_name]
+        if field in RANGE_BUCKETS:
+            spec = active.setdefault(field, {"kind": "range", "low": None, "high": None})
+            spec["low" if operator == "__ge__" else "high"] = value
+        elif field in FLAG_FACETS + CATEGORICAL_FACETS + FILTER_ONLY_FIELDS:
+            active[field] = {"kind": "values", "values": value if isinstance(value, list) else [value]}
+    return active
+
+
+facet_index = FacetIndex()
+
+
+@router.post("/facets")
+async def facet_counts(request: Request):
+    """Counts per filter option given the currently active filters (same params as /search/property)."""
+    start = time.perf_counter()
+    params = await request.json() if await request.body() else {}
+    # Counts over one listing, or all but one, give away the price bucket of a game target
+    if any(FILTER_PARAMS[name][0] == "id" for name, value in params.items()
+           if name in FILTER_PARAMS and value not in (None, "", [])):
+        raise HTTPException(status_code=422, detail="Facets do not take id filters.")
+    result = facet_index.counts(params)
+    result["took_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def load_datasets(names=None):
+    """Indexes the data loader files of this node, optionally only the named loaders."""
+    for name, path in hosted_datasets():
+        if (names is None or name in names) and os.path.exists(path):
+            facet_index.load_csv(path, settings.chunk_size)
+
+
+def load_collection():
+    """Rebuilds the facet index from the rows ingested into this node's collection.
+
+    The rebuild goes into a fresh index that then replaces the served one, so ids deleted or
+    ingested through another worker are reflected and counts never drop to a partial load.
+    """
+    client = get_client()
+    try:
+        if not client.collection_exists(settings.qdrant_collection):
+            return
+        started = time.perf_counter()
+        rebuilt = FacetIndex()
+        rebuilt.load_collection(client, settings.qdrant_collection, settings.chunk_size)
+        facet_index.replace(rebuilt)
+        logger.info("Facet index rebuilt from %s: %d rows in %.1fs",
+                    settings.qdrant_collection, len(facet_index), time.perf_counter() - started)
+    except Exception:
+        # Counts stay as they are until the next rebuild rather than keeping the server from starting
+        logger.exception("Could not rebuild the facet index from %s", settings.qdrant_collection)
+
+
+def refresh_collection():
+    """Loads the facet index, then rebuilds it every facet_refresh_seconds (0 loads once)."""
+    load_collection()
+    while settings.facet_refresh_seconds > 0:
+        time.sleep(settings.facet_refresh_seconds)
+        load_collection()
+
+
+def start_loading_collection():
+    """Rebuilds the facet index in the background, so workers answer health checks while it loads.
+
+    Every worker keeps its own index and only sees the ingestion requests it served itself,
+    the periodic rebuild from Qdrant is what brings all of them back in step.
+    """
+    threading.Thread(target=refresh_collection, name="facet-index-load", daemon=True).start()
+
+
+class FacetIngestMiddleware:
+    """Keeps the facet index in step with REST source ingestion and data loader runs."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"].rstrip("/")
+        is_loader_run = path.startswith(DATA_LOADER_PREFIX) and path.endswith("/run")
+        if not is_loader_run and path != INGEST_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        body = []
+        status = {}
+
+        async def tapped_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                body.append(message.get("body", b""))
+            return message
+
+        async def tapped_send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        await self.app(scope, tapped_receive, tapped_send)
+        if not 200 <= status.get("code", 500) < 300:
+            return
+        if is_loader_run:
+            # Data loader files are re-read whole; rows with known ids replace their previous bits.
+            # The run itself finishes in the background, the next rebuild corrects rows it failed on.
+            name = path[len(DATA_LOADER_PREFIX):-len("/run")]
+            threading.Thread(target=load_datasets, args=([name],), daemon=True).start()
+        else:
+            payload = json.loads(b"".join(body) or b"null")
+            if payload:
+                await run_in_threadpool(facet_index.add_records, payload if isinstance(payload, list) else [payload])
@@ -1,8 +1,10 @@
 from collections import namedtuple
 
+from qdrant_client import models
 from superlinked import framework as sl
 
 from superlinked_app.index import real_estate_schema
+from superlinked_app.qdrant import ENTITY_ID_PREFIX, ORIGINAL_ID_FIELD, payload_field
 
 # Hard filters for fields without spaces
 PropertyFilter = namedtuple(
@@ -177,3 +179,39 @@ def apply_filters(query):
         query = query.filter(filter_item.operator(param))
 
     return query
+
+
+# param_name -> (field_name, operator name), for code that evaluates the filters outside Superlinked
+FILTER_PARAMS = {
+    filter_item.param_name: (filter_item.field_name, filter_item.operator.__name__)
+    for filter_item in filters
+}
+
+
+def qdrant_filter(params):
+    """Translates hard filter params into a Qdrant payload filter for routes that query Qdrant directly."""
+    must = []
+    must_not = []
+    for param_name, value in params.items():
+        if param_name not in FILTER_PARAMS or value is None or value == "" or value == []:
+            continue
+        field_name, operator = FILTER_PARAMS[param_name]
+        key = payload_field(field_name)
+        if operator in ("in_", "not_in_"):
+            values = value if isinstance(value, list) else [value]
+            if field_name == "id":
+                # The IdField is not stored under the schema prefix, only as "<schema>:<id>"
+                key = ORIGINAL_ID_FIELD
+                values = [f"{ENTITY_ID_PREFIX}{v}" for v in values]
+            condition = models.FieldCondition(key=key, match=models.MatchAny(any=values))
+            (must if operator == "in_" else must_not).append(condition)
+        elif operator == "__eq__":
+            must.append(models.FieldCondition(key=key, match=models.MatchValue(value=value)))
+        elif operator == "__le__":
+            must.append(models.FieldCondition(key=key, range=models.Range(lte=value)))
+        elif operator == "__ge__":
+            must.append(models.FieldCondition(key=key, range=models.Range(gte=value)))
+
+    if not must and not must_not:
+        return None
+    return models.Filter(must=must or None, must_not=must_not or None)
@@ -0,0 +1,153 @@
+import math
+import time
+from dataclasses import dataclass
+
+import httpx
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request
+from qdrant_client import models
+from starlette.concurrency import run_in_threadpool
+
+from superlinked_app.config import settings
+from superlinked_app.cursors import CursorStore
+from superlinked_app.qdrant import find_point, get_client, to_entry
+
+router = APIRouter(prefix="/api/v1/game")
+
+# Fields that give the price away; they stay on the server until the guess is scored
+HIDDEN_FIELDS = ["price", "pricePerSquareFoot", "eventHistory"]
+# Largest relative deviation for each medal, best first
+MEDALS = [(0.1, "gold"), (0.2, "silver"), (0.3, "bronze")]
+ESTIMATE_NEIGHBORS = 30
+
+
+@dataclass
+class GameEntry:
+    """The target a game token was issued for; the token is consumed by its one scored guess."""
+
+    property_id: str
+    expires_at: float
+
+
+# Same bounded TTL store as pagination cursors, so game tokens are per worker as well
+game_store = CursorStore(settings.game_max_entries, settings.game_ttl_seconds)
+
+
+def weighted_quantiles(values, weights, quantiles):
+    """Quantiles of values where each value counts by its weight (midpoint interpolation)."""
+    order = np.argsort(values)
+    values, weights = values[order], weights[order]
+    cumulative = (np.cumsum(weights) - 0.5 * weights) / weights.sum()
+    return np.interp(quantiles, cumulative, values)
+
+
+def summarize_neighbors(entries, living_area):
+    """Weighted median and IQR of neighbor prices plus price per sqft times the target's living area."""
+    fields = [entry.get("fields", {}) for entry in entries]
+    prices = np.array([f.get("price") or np.nan for f in fields], dtype=np.float64)
+    price_per_sqft = np.array([f.get("pricePerSquareFoot") or np.nan for f in fields], dtype=np.float64)
+    # Closer neighbors count more; scores can be slightly negative for far matches
+    weights = np.clip([entry.get("metadata", {}).get("score") or 0.0 for entry in entries], 0.0, None)
+    if not weights.any():
+        weights = np.ones(len(entries))
+
+    summary = {"neighbors": int(np.isfinite(prices).sum()), "median": None, "q1": None, "q3": None,
+               "iqr": None, "price_per_sqft_estimate": None}
+    known = np.isfinite(prices) & (prices > 0)
+    if known.any():
+        q1, median, q3 = weighted_quantiles(prices[known], weights[known], [0.25, 0.5, 0.75])
+        summary.update(median=round(median), q1=round(q1), q3=round(q3), iqr=round(q3 - q1))
+    known = np.isfinite(price_per_sqft) & (price_per_sqft > 0)
+    if known.any() and living_area:
+        median_per_sqft = weighted_quantiles(price_per_sqft[known], weights[known], [0.5])[0]
+        summary["price_per_sqft_estimate"] = round(median_per_sqft * float(living_area))
+    return summary
+
+
+def score_guess(guess, actual_price):
+    deviation = abs(guess - actual_price) / actual_price
+    medal = next((name for limit, name in MEDALS if deviation <= limit), None)
+    message = f"Congratulations! You won the {medal.capitalize()} Medal!" if medal \
+        else "Sorry, your guess was unsuccessful. Try again!"
+    return {
+        "success": medal is not None,
+        "medal": medal,
+        "message": message,
+        "guess": guess,
+        "actualPrice": actual_price,
+        "deviation": deviation * 100,
+    }
+
+
+def get_target(property_id):
+    point = find_point(get_client(), settings.qdrant_collection, property_id)
+    if point is None:
+        raise HTTPException(status_code=404, detail=f"Unknown property id {property_id}.")
+    return to_entry(point)
+
+
+def random_target():
+    points = get_client().query_points(
+        settings.qdrant_collection,
+        query=models.SampleQuery(sample=models.Sample.RANDOM),
+        limit=1,
+        with_payload=True,
+    ).points
+    if not points:
+        raise HTTPException(status_code=404, detail="No properties ingested yet.")
+    return to_entry(points[0])
+
+
+@router.get("/target")
+async def game_target():
+    """A random property to guess, without the fields that reveal its price, and the token to guess it with."""
+    entry = await run_in_threadpool(random_target)
+    fields = {key: value for key, value in entry["fields"].items() if key not in HIDDEN_FIELDS}
+    token = game_store.put(GameEntry(property_id=entry["id"], expires_at=0.0))
+    return {"id": entry["id"], "token": token, "fields": fields}
+
+
+@router.get("/estimate/{property_id}")
+async def game_estimate(property_id: str):
+    """Price hint from the target's similar_property neighborhood, a few hundred bytes instead of the listings."""
+    start = time.perf_counter()
+    target = await run_in_threadpool(get_target, property_id)
+    async with httpx.AsyncClient(timeout=settings.shard_timeout) as client:
+        response = await client.post(
+            f"{settings.superlinked_url.rstrip('/')}/api/v1/search/similar_property",
+            json={
+                "id": property_id,
+                "limit": ESTIMATE_NEIGHBORS,
+                "ids_exclude": [property_id],
+                # The target's own price embedding would steer the neighbors towards the answer
+                "price_weight": 0.0,
+                "price_per_sqft_weight": 0.0,
+            },
+            headers={"x-include-metadata": "True"},
+        )
+    if response.status_code >= 400:
+        raise HTTPException(status_code=response.status_code, detail=response.text)
+    summary = summarize_neighbors(response.json().get("entries", []), target["fields"].get("livingArea"))
+    summary["took_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return {"id": property_id, **summary}
+
+
+@router.post("/guess")
+async def game_guess(request: Request):
+    """Scores {"token": "...", "guess": 250000} against the stored price, once per token from /target."""
+    body = await request.json()
+    try:
+        guess = float(str(body.get("guess", "")).replace(",", "").replace("$", ""))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="guess must be a number.")
+    if not math.isfinite(guess) or guess <= 0:
+        raise HTTPException(status_code=422, detail="guess must be a positive number.")
+    # Popping the token makes the actual price a one-time answer rather than a lookup by id
+    game = game_store.pop(str(body.get("token", "")))
+    if game is None:
+        raise HTTPException(status_code=404, detail="Game expired or already scored, start a new one.")
+    target = await run_in_threadpool(get_target, game.property_id)
+    actual_price = target["fields"].get("price")
+    if not actual_price:
+        raise HTTPException(status_code=422, detail="Property has no price to score against.")
+    return score_guess(guess, float(actual_price))
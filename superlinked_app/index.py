@@ -40,6 +40,9 @@ class RealEstate(sl.Schema):
     lotAreaUnits: Optional[sl.String]
     homeType: Optional[sl.String]
 
+    # Earlier listings of the same home, 'date|event|price' entries joined by ';' (scripts/dedup.py)
+    eventHistory: Optional[sl.String]
+
     # Boolean fields (stored as integers 0/1)
     is_bankOwned: Optional[sl.Integer]
     is_forAuction: Optional[sl.Integer]
@@ -178,5 +181,6 @@ index = sl.Index(
         real_estate_schema.isNewConstruction,
         real_estate_schema.hasPetsAllowed,
         real_estate_schema.time,
+        real_estate_schema.eventHistory,
     ],
 )
\ No newline at end of file
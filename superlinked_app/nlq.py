@@ -8,8 +8,8 @@ with open('data/column_statistics.json', 'r') as f:
     column_stats = json.load(f)
 
 # Extract unique values
-available_cities = column_stats['city']['unique_values'][:10]  # First 10 cities as examples
-available_counties = column_stats['county']['unique_values'][:10]  # First 10 counties
+# Cities only feed the worked examples; per-query candidates come from superlinked_app/vocabulary.py
+available_cities = column_stats['city']['unique_values'][:4]
 available_states = column_stats['state']['unique_values']
 available_home_types = column_stats['homeType']['unique_values']
 available_events = column_stats['event']['unique_values']
@@ -39,8 +39,8 @@ description_description = (
 )
 
 city_description = (
-    f"List of exact cities explicitly mentioned, order as in query. "
-    f"Examples include: {', '.join(available_cities)}. "
+    "List of exact cities explicitly mentioned, order as in query. "
+    "Spell them as in the 'Candidate cities' line when one matches. "
     "If none or ambiguous, use an empty list []. Do NOT infer from neighborhoods."
 )
 
@@ -50,7 +50,7 @@ state_description = (
 )
 
 county_description = (
-    f"List of exact counties explicitly mentioned (e.g., {', '.join(available_counties)}). "
+    "List of exact counties explicitly mentioned, spelled as in the 'Candidate counties' line when one matches. "
     "Do NOT infer from city/state. If none, use []."
 )
 
@@ -112,6 +112,8 @@ system_prompt = (
     "• Enums: MUST be from the allowed sets (home_type, event, levels). If no match, leave the list empty [].\n"
     "• Ambiguity: If multiple cities/counties/states are mentioned, include them all in order of appearance (deduplicate). "
     "If none are explicit, use []. Do NOT infer city from county or vice versa.\n"
+    "• Candidates: the query may end with 'Candidate cities: ...' and 'Candidate counties: ...' lines from a fuzzy lookup. "
+    "Use them only to spell places the user actually mentioned; never add a candidate the query does not name.\n"
     "• 'id' ONLY if an explicit ID/MLS is present. Otherwise null.\n"
     "• 'description' is terse keywords for notable amenities/features only.\n"
     "• Bedrooms/Bathrooms: If exact number (e.g., '2 bedrooms'), set min and max to same value. If 'at least 2', set only min_bedrooms=2, max_bedrooms=null. If 'up to 3', set only max_bedrooms=3, min_bedrooms=null. If 'around 2' or 'approximately 2', set min_bedrooms=2, max_bedrooms=2 (no tolerance for discrete values).\n"
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from superlinked_app.config import settings
+
+router = APIRouter(prefix="/api/v1/profiles")
+
+# Only the RestDescriptor search endpoints can be profiled
+PROFILED_PATHS = {f"/api/v1/search/{descriptor}" for descriptor in ("property", "similar_property", "debug")}
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Frames of idle worker threads, they carry no request work
+IDLE_FUNCTIONS = {"wait", "_worker", "get", "select", "poll", "_wait_for_tstate_lock"}
+# Event loop callback that runs one step of a task; the task's own frames start above it
+TASK_STEP_CODE = asyncio.events.Handle._run.__code__
+
+# Sampler of the request being profiled; tasks started for it (e.g. by BaseHTTPMiddleware) inherit the value
+profiled_request = ContextVar("profiled_request", default=None)
+
+
+def frame_label(frame):
+    # No line numbers, so samples from the same function merge in the flame graph
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+def collapse(frame, stop_at=None):
+    """Root-first frame labels from the bottom of the stack (or stop_at) up to frame."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        if frame is stop_at:
+            break
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def task_step_frame(frame):
+    current = frame
+    while current is not None and current.f_code is not TASK_STEP_CODE:
+        current = current.f_back
+    return current
+
+
+def tagging_task_factory(previous):
+    """Task factory that registers tasks created under a profiled request with its sampler.
+
+    Tasks of the C implementation don't expose their context before Python 3.12, so the tag is read here instead.
+    """
+    def factory(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        sampler = context.get(profiled_request) if context is not None else profiled_request.get()
+        if sampler is not None:
+            sampler.tasks.add(task)
+        return task
+    factory.tags_profiled_requests = True
+    return factory
+
+
+class RequestSampler:
+    """Samples stacks while one request runs, in collapsed stack format (one 'a;b;c count' line per stack)."""
+
+    def __init__(self, loop, loop_thread, interval):
+        self.loop = loop
+        self.loop_thread = loop_thread
+        self.interval = interval
+        # The request's task and every task started under it
+        self.tasks = weakref.WeakSet()
+        self.stacks = Counter()
+        self.samples = 0
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="request-profiler", daemon=True)
+
+    def sample(self):
+        own = threading.get_ident()
+        task = asyncio.current_task(self.loop)
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            if thread_id == self.loop_thread:
+                # Event loop samples count only while one of this request's tasks is running
+                if task is not None and task in self.tasks:
+                    self.stacks[collapse(frame, stop_at=task_step_frame(frame))] += 1
+            elif frame.f_code.co_name not in IDLE_FUNCTIONS:
+                # Thread pool work started by the request; under concurrent load this may include other requests
+                self.stacks[f"thread;{collapse(frame)}"] += 1
+        self.samples += 1
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_path(profile_id):
+    return os.path.join(settings.path_profiles, f"{profile_id}.collapsed")
+
+
+def save_profile(sampler, path, elapsed):
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}"
+    os.makedirs(settings.path_profiles, exist_ok=True)
+    with open(profile_path(profile_id), "w") as f:
+        f.write(f"# {path} {elapsed * 1000:.1f} ms, {sampler.samples} samples every {sampler.interval * 1000:g} ms\n")
+        f.write(sampler.collapsed())
+    return profile_id
+
+
+def authorized(header_value):
+    secret = settings.profiling_secret.get_secret_value()
+    return bool(secret) and secrets.compare_digest(header_value.encode(), secret.encode())
+
+
+class ProfilingMiddleware:
+    """Profiles a search request carrying 'x-profile: <secret>' and returns the profile id in 'x-profile-id'.
+
+    Only mounted when profiling_enabled is set, so other deployments pay nothing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].rstrip("/") not in PROFILED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        header = next((v for k, v in scope["headers"] if k.lower() == PROFILE_HEADER), None)
+        if header is None or not authorized(header.decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+
+        # Id is only known once the request finished, so hold the response until then
+        start_message = None
+        messages = []
+
+        async def held_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            messages.append(message)
+
+        loop = asyncio.get_running_loop()
+        if not getattr(loop.get_task_factory(), "tags_profiled_requests", False):
+            loop.set_task_factory(tagging_task_factory(loop.get_task_factory()))
+
+        started = time.perf_counter()
+        with RequestSampler(loop, threading.get_ident(), settings.profiling_interval) as sampler:
+            sampler.tasks.add(asyncio.current_task())
+            token = profiled_request.set(sampler)
+            try:
+                await self.app(scope, receive, held_send)
+            finally:
+                profiled_request.reset(token)
+        profile_id = save_profile(sampler, scope["path"], time.perf_counter() - started)
+
+        if start_message is not None:
+            await send({
+                **start_message,
+                "headers": [*start_message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())],
+            })
+        for message in messages:
+            await send(message)
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, request: Request):
+    """Collapsed stacks of a profiled request, ready for flamegraph.pl or speedscope."""
+    if not authorized(request.headers.get(PROFILE_HEADER.decode(), "")):
+        raise HTTPException(status_code=403, detail="Missing or wrong x-profile secret.")
+    if not PROFILE_ID_PATTERN.match(profile_id) or not os.path.exists(profile_path(profile_id)):
+        raise HTTPException(status_code=404, detail="Unknown profile id.")
+    with open(profile_path(profile_id)) as f:
+        return f.read()
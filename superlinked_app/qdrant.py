@@ -0,0 +1,116 @@
+import json
+import os
+from functools import lru_cache
+
+from qdrant_client import QdrantClient, models
+
+from superlinked_app.config import settings
+
+# Superlinked stores schema fields in the point payload under this prefix
+PAYLOAD_FIELD_PREFIX = "__schema_field__RealEstate_"
+ORIGINAL_ID_FIELD = "__original_entity_id__"
+# Original ids are stored as "<schema>:<id>"
+ENTITY_ID_PREFIX = "RealEstate:"
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """Returns the Qdrant client shared by the routes that bypass Superlinked."""
+    return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key or None)
+
+
+def payload_field(field_name):
+    return f"{PAYLOAD_FIELD_PREFIX}{field_name}"
+
+
+def to_entry(point):
+    """Shapes a Qdrant point like a Superlinked result entry."""
+    payload = point.payload or {}
+    fields = {
+        key[len(PAYLOAD_FIELD_PREFIX):]: value
+        for key, value in payload.items()
+        if key.startswith(PAYLOAD_FIELD_PREFIX)
+    }
+    original_id = str(payload.get(ORIGINAL_ID_FIELD, "")).split(":", 1)[-1]
+    return {
+        "id": str(fields.get("id", original_id)),
+        "fields": fields,
+        "metadata": {"score": getattr(point, "score", None)},
+    }
+
+
+def find_point(client, collection, property_id):
+    """Returns the point of a property by its schema id, or None."""
+    points, _ = client.scroll(
+        collection,
+        scroll_filter=models.Filter(must=[
+            models.FieldCondition(key=ORIGINAL_ID_FIELD, match=models.MatchValue(value=f"{ENTITY_ID_PREFIX}{property_id}")),
+        ]),
+        limit=1,
+        with_payload=True,
+    )
+    return points[0] if points else None
+
+
+def delete_points(client, collection, property_ids):
+    """Deletes the points of the given schema ids."""
+    client.delete(
+        collection,
+        points_selector=models.FilterSelector(filter=models.Filter(must=[
+            models.FieldCondition(
+                key=ORIGINAL_ID_FIELD,
+                match=models.MatchAny(any=[f"{ENTITY_ID_PREFIX}{property_id}" for property_id in property_ids]),
+            ),
+        ])),
+        wait=True,
+    )
+
+
+def vector_name(client, collection):
+    """Returns the name of the collection's dense vector, or None for an unnamed vector."""
+    vectors = client.get_collection(collection).config.params.vectors
+    if isinstance(vectors, dict):
+        return next(iter(vectors))
+    return None
+
+
+@lru_cache(maxsize=1)
+def search_ef():
+    """Tuned search-time ef for the collection's size, looked up once per process."""
+    client = get_client()
+    return hnsw_profile(client.count(settings.qdrant_collection, exact=False).count).get("ef")
+
+
+@lru_cache(maxsize=1)
+def search_vector_name():
+    return vector_name(get_client(), settings.qdrant_collection)
+
+
+def vector_search(vector, query_filter, limit, offset=0):
+    """Plain vector search on this node's collection; no NLQ call and no embedding."""
+    ef = search_ef()
+    return get_client().query_points(
+        settings.qdrant_collection,
+        query=vector,
+        using=search_vector_name(),
+        query_filter=query_filter,
+        search_params=models.SearchParams(hnsw_ef=ef) if ef else None,
+        offset=offset,
+        limit=limit,
+        with_payload=True,
+    ).points
+
+
+def hnsw_profile(point_count):
+    """Returns the tuned HNSW settings for a collection of point_count points, or {} if none were tuned."""
+    if not os.path.exists(settings.path_hnsw_profiles):
+        return {}
+    with open(settings.path_hnsw_profiles, 'r') as f:
+        profiles = json.load(f)
+    if not profiles:
+        return {}
+    # Profiles are keyed by the largest collection size they apply to
+    for size in sorted(profiles, key=int):
+        if point_count <= int(size):
+            return profiles[size]
+    return profiles[max(profiles, key=int)]
@@ -0,0 +1,37 @@
+from superlinked.server.app import ServerApp
+from superlinked.server.logger import ServerLoggerConfigurator
+
+from superlinked_app.bulk_ingest import router as bulk_ingest_router
+from superlinked_app.config import settings
+from superlinked_app.cursors import router as cursors_router
+from superlinked_app.facets import FacetIngestMiddleware, start_loading_collection
+from superlinked_app.facets import router as facets_router
+from superlinked_app.game import router as game_router
+from superlinked_app.profiling import ProfilingMiddleware
+from superlinked_app.profiling import router as profiling_router
+from superlinked_app.shard_node import router as shard_node_router
+from superlinked_app.sharding import router as sharding_router
+from superlinked_app.vocabulary import NLQVocabularyMiddleware
+
+
+def create_app():
+    """Builds the Superlinked server app with the game's additional routes; called once per uvicorn worker."""
+    ServerLoggerConfigurator.setup_logger()
+    # Facet bitmaps for rows ingested before this worker started
+    start_loading_collection()
+
+    app = ServerApp().app
+    app.include_router(sharding_router)
+    app.include_router(shard_node_router)
+    app.include_router(facets_router)
+    app.include_router(cursors_router)
+    app.include_router(game_router)
+    app.include_router(bulk_ingest_router)
+    app.add_middleware(FacetIngestMiddleware)
+    app.add_middleware(NLQVocabularyMiddleware)
+    # Added last so the profile covers the other middlewares too; not mounted at all when disabled
+    if settings.profiling_enabled:
+        app.include_router(profiling_router)
+        app.add_middleware(ProfilingMiddleware)
+    return app
+
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from superlinked_app.config import settings
+from superlinked_app.filters import qdrant_filter
+from superlinked_app.qdrant import find_point, get_client, to_entry, vector_search
+from superlinked_app.sharding import NODE_PREFIX
+
+# Kept apart from sharding.py, which scripts import without loading the index
+router = APIRouter(prefix=NODE_PREFIX)
+
+
+@router.get("/points/{property_id}")
+async def hosted_point(property_id: str):
+    """200 if this node stores the property, 404 otherwise."""
+    point = await run_in_threadpool(find_point, get_client(), settings.qdrant_collection, property_id)
+    if point is None:
+        raise HTTPException(status_code=404, detail=f"Unknown property id {property_id}.")
+    return {"id": property_id}
+
+
+@router.post("/vector-search")
+async def node_vector_search(request: Request):
+    """Searches this node's collection with a given vector: {"vector": [...], "params": {...filters, "limit"}}."""
+    body = await request.json()
+    params = body.get("params") or {}
+    points = await run_in_threadpool(
+        vector_search, body["vector"], qdrant_filter(params), int(params.get("limit", 10)),
+    )
+    return {"entries": [to_entry(point) for point in points]}
@@ -0,0 +1,172 @@
+import asyncio
+import os
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+
+from superlinked_app.config import settings
+
+router = APIRouter(prefix="/api/v1/sharded")
+# Routes every node serves for the scatter-gather of other nodes, see superlinked_app/shard_node.py
+NODE_PREFIX = "/api/v1/sharded/node"
+
+
+def hosted_shards():
+    """Returns the shards whose data is ingested by this node."""
+    if settings.shard_name:
+        return [settings.shard_name]
+    return list(settings.shards)
+
+
+def shard_dataset_path(shard):
+    """Returns the per-shard dataset written by scripts/preprocess.py."""
+    return os.path.join(settings.path_shards, f"{shard}.csv")
+
+
+def hosted_datasets():
+    """Returns (data loader name, dataset path) for every data loader of this node."""
+    if settings.shards:
+        return [(f"properties_{shard}", shard_dataset_path(shard)) for shard in hosted_shards()]
+    return [("properties", settings.path_dataset)]
+
+
+def shards_for_states(states):
+    """Returns the shards holding any of the given states, or every shard if no state is given."""
+    if not states:
+        return list(settings.shards)
+    if isinstance(states, str):
+        states = [states]
+    wanted = {state.lower() for state in states}
+    return [
+        shard for shard, members in settings.shards.items()
+        if wanted & {member.lower() for member in members}
+    ]
+
+
+def shard_url(shard):
+    # Shards without a dedicated node are served by the local Superlinked server
+    return settings.shard_urls.get(shard, settings.superlinked_url).rstrip("/")
+
+
+def merge_results(responses, limit):
+    """Merges shard responses into a single top-k result ordered by score."""
+    entries = [entry for response in responses for entry in response.get("entries", [])]
+    entries.sort(key=lambda entry: entry.get("metadata", {}).get("score", 0.0), reverse=True)
+    metadata = responses[0].get("metadata", {}) if responses else {}
+    return {"entries": entries[:limit], "metadata": metadata}
+
+
+def shard_params(payload, search_params):
+    """Parameters for the shards: the NLQ-extracted ones, without natural_query so no shard calls the LLM again."""
+    params = {**payload, **{key: value for key, value in (search_params or {}).items() if value is not None}}
+    params.pop("natural_query", None)
+    params["limit"] = payload.get("limit", 10)
+    return params
+
+
+async def post_search(client, url, descriptor, payload):
+    response = await client.post(
+        f"{url}/api/v1/search/{descriptor}",
+        json=payload,
+        headers={"x-include-metadata": "True"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def post_vector_search(client, url, vector, params):
+    response = await client.post(f"{url}{NODE_PREFIX}/vector-search", json={"vector": vector, "params": params})
+    response.raise_for_status()
+    return response.json()
+
+
+async def find_holder(client, property_id):
+    """URL of the node storing property_id; every node is asked since ids say nothing about states."""
+    urls = list(dict.fromkeys(shard_url(shard) for shard in settings.shards))
+    answers = await asyncio.gather(
+        *[client.get(f"{url}{NODE_PREFIX}/points/{property_id}") for url in urls],
+        return_exceptions=True,
+    )
+    for url, answer in zip(urls, answers):
+        if not isinstance(answer, Exception) and answer.status_code == 200:
+            return url
+    errors = [repr(answer) for answer in answers if isinstance(answer, Exception)]
+    if errors:
+        raise HTTPException(status_code=502, detail=f"Property {property_id} not found, nodes failed: {errors}")
+    raise HTTPException(status_code=404, detail=f"Unknown property id {property_id}.")
+
+
+async def scatter_gather(descriptor, payload):
+    """Sends a search to the shards relevant for its state filter and merges the answers.
+
+    A natural query is parsed once by the local node; the shards get the extracted parameters instead.
+    A query by id (similar_property) runs once on the node storing the id, and the other shards get a plain
+    vector search with the search vector it used. Shards that fail are left out and reported in
+    metadata.shard_errors.
+    """
+    local_url = settings.superlinked_url.rstrip("/")
+    async with httpx.AsyncClient(timeout=settings.shard_timeout) as client:
+        if not settings.shards:
+            return await post_search(client, local_url, descriptor, payload)
+
+        # Node answering first, with the parameters (and vector) the other shards reuse
+        anchor_url = None
+        if payload.get("id") is not None:
+            anchor_url = await find_holder(client, payload["id"])
+        elif payload.get("natural_query"):
+            anchor_url = local_url
+
+        parsed = None
+        params = payload
+        vector = None
+        if anchor_url is not None:
+            try:
+                parsed = await post_search(client, anchor_url, descriptor, payload)
+            except httpx.HTTPStatusError as e:
+                raise HTTPException(status_code=e.response.status_code, detail=e.response.text)
+            except httpx.HTTPError as e:
+                raise HTTPException(status_code=502, detail=f"Search failed on {anchor_url}: {e!r}")
+            metadata = parsed.get("metadata", {})
+            params = shard_params(payload, metadata.get("search_params"))
+            if payload.get("id") is not None:
+                vector = metadata.get("search_vector")
+                if vector is None:
+                    raise HTTPException(status_code=502, detail="Search vector missing from the result metadata.")
+
+        # Several shards may live on the same node, query each node only once
+        urls = {}
+        for shard in shards_for_states(params.get("state_filter")):
+            urls.setdefault(shard_url(shard), []).append(shard)
+        # The anchor node already answered with the same parameters
+        pending = [url for url in urls if url != anchor_url]
+        answers = await asyncio.gather(
+            *[
+                post_vector_search(client, url, vector, params) if vector is not None
+                else post_search(client, url, descriptor, params)
+                for url in pending
+            ],
+            return_exceptions=True,
+        )
+
+    results = [parsed] if parsed is not None and anchor_url in urls else []
+    shard_errors = {}
+    for url, answer in zip(pending, answers):
+        if isinstance(answer, Exception):
+            shard_errors[",".join(urls[url])] = repr(answer)
+        else:
+            results.append(answer)
+    if urls and not results:
+        raise HTTPException(status_code=502, detail={"shard_errors": shard_errors})
+
+    merged = merge_results(results, int(payload.get("limit", 10)))
+    if parsed is not None:
+        merged["metadata"] = parsed.get("metadata", {})
+    merged["metadata"] = {**merged["metadata"], "shard_errors": shard_errors}
+    return merged
+
+
+@router.post("/search/{descriptor}")
+async def sharded_search(descriptor: str, request: Request):
+    """Same contract as /api/v1/search/{descriptor}, routed by state_filter across shards."""
+    payload = await request.json()
+    return await scatter_gather(descriptor, payload)
@@ -0,0 +1,192 @@
+import json
+import logging
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+import instructor
+from superlinked.framework.dsl.query.nlq.nlq_clause_collector import NLQClauseCollector
+from superlinked.framework.dsl.query.nlq.param_filler.query_param_model_builder import QueryParamModelBuilder
+from superlinked.framework.dsl.query.nlq.param_filler.query_param_prompt_builder import QueryParamPromptBuilder
+
+from superlinked_app.nlq import column_stats, system_prompt
+
+logger = logging.getLogger(__name__)
+
+NLQ_PATH = "/api/v1/search/property"
+
+# Words that never start a place name on their own in this game's queries
+STOPWORDS = {
+    "a", "an", "and", "or", "the", "in", "near", "at", "of", "for", "with", "under", "over", "around", "between",
+    "to", "from", "by", "on", "homes", "home", "house", "houses", "condo", "condos", "bedroom", "bedrooms",
+    "bathroom", "bathrooms", "sqft", "square", "feet", "meters", "pool", "garage", "sale", "sold", "rent",
+}
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text):
+    """Token count with tiktoken when installed, otherwise the usual ~4 characters per token estimate."""
+    encoding = get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text))
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NGramIndex:
+    """Character trigram index for fuzzy lookup of place names."""
+
+    def __init__(self, terms):
+        self.terms = sorted({term.lower() for term in terms if term})
+        self.term_grams = [trigrams(term) for term in self.terms]
+        self.postings = defaultdict(list)
+        for position, grams in enumerate(self.term_grams):
+            for gram in grams:
+                self.postings[gram].append(position)
+
+    def lookup(self, phrase, min_similarity):
+        """Returns (similarity, term) pairs whose Dice coefficient with phrase reaches min_similarity."""
+        grams = trigrams(phrase)
+        shared = defaultdict(int)
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                shared[position] += 1
+        matches = []
+        for position, count in shared.items():
+            similarity = 2 * count / (len(grams) + len(self.term_grams[position]))
+            if similarity >= min_similarity:
+                matches.append((similarity, self.terms[position]))
+        return matches
+
+
+def query_phrases(natural_query, max_words=3):
+    """Word n-grams of the query that could name a place."""
+    words = re.findall(r"[a-z0-9][a-z0-9'.-]*", natural_query.lower())
+    for size in range(1, max_words + 1):
+        for start in range(len(words) - size + 1):
+            phrase = words[start:start + size]
+            if phrase[0] in STOPWORDS or phrase[-1] in STOPWORDS:
+                continue
+            text = " ".join(phrase)
+            if len(text) >= 4:
+                yield text
+
+
+class Vocabulary:
+    """Picks the cities and counties relevant to one query out of the whole dataset."""
+
+    def __init__(self, column_stats, min_similarity=0.75, limit=5):
+        self.min_similarity = min_similarity
+        self.limit = limit
+        self.indexes = {
+            "cities": NGramIndex(column_stats.get("city", {}).get("unique_values", [])),
+            "counties": NGramIndex(column_stats.get("county", {}).get("unique_values", [])),
+        }
+
+    def candidates(self, natural_query):
+        phrases = list(query_phrases(natural_query))
+        found = {}
+        for kind, index in self.indexes.items():
+            best = {}
+            for phrase in phrases:
+                for similarity, term in index.lookup(phrase, self.min_similarity):
+                    best[term] = max(similarity, best.get(term, 0.0))
+            ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+            if ranked:
+                found[kind] = [term for term, _ in ranked[:self.limit]]
+        return found
+
+    def annotate(self, natural_query):
+        """Appends the candidate lines the system prompt refers to; the query itself is left unchanged."""
+        found = self.candidates(natural_query)
+        if not found:
+            return natural_query
+        lines = [f"Candidate {kind}: {', '.join(terms)}" for kind, terms in found.items()]
+        return natural_query + "\n\n" + "\n".join(lines)
+
+
+vocabulary = Vocabulary(column_stats)
+
+
+@lru_cache(maxsize=1)
+def prefix_tokens():
+    """Tokens sent identically with every NLQ call, so providers can cache them as a prefix.
+
+    That is the system message Superlinked renders around system_prompt (the param descriptions from nlq.py
+    included) plus the tool schema instructor builds from the parameter model.
+    """
+    from superlinked_app.query import query
+
+    collector = NLQClauseCollector(query.clauses, query._space_weight_param_info)
+    instructor_prompt = QueryParamPromptBuilder.calculate_instructor_prompt(collector, system_prompt)
+    model = QueryParamModelBuilder.build(collector)
+    tool = {"type": "function", "function": instructor.openai_schema(model).openai_schema}
+    return count_tokens(instructor_prompt) + count_tokens(json.dumps(tool))
+
+
+class NLQVocabularyMiddleware:
+    """Adds per-query city/county candidates to natural_query and reports prompt token counts."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") != NLQ_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+
+        query_tokens = 0
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and payload.get("natural_query"):
+            payload["natural_query"] = vocabulary.annotate(payload["natural_query"])
+            query_tokens = count_tokens(payload["natural_query"])
+            body = json.dumps(payload).encode()
+            logger.info("NLQ prompt tokens: %d cached prefix + %d query", prefix_tokens(), query_tokens)
+
+        headers = [(k, v) for k, v in scope["headers"] if k.lower() != b"content-length"]
+        headers.append((b"content-length", str(len(body)).encode()))
+        scope = {**scope, "headers": headers}
+        sent = False
+
+        async def replay_receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_with_tokens(message):
+            if message["type"] == "http.response.start" and query_tokens:
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"x-nlq-prompt-tokens", f"prefix={prefix_tokens()},query={query_tokens}".encode()),
+                    ],
+                }
+            await send(message)
+
+        await self.app(scope, replay_receive, send_with_tokens)
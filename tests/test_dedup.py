@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from dedup import collapse_duplicates, group_listings  # noqa: E402
+
+TEMPLATE = ("Welcome to this bright corner unit with floor to ceiling windows, an open kitchen, "
+            "in-unit laundry and access to the rooftop pool, gym and 24 hour concierge.")
+
+
+def listings(rows):
+    columns = ["streetAddress", "zipcode", "latitude", "longitude", "description"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def test_condo_units_with_template_descriptions_stay_apart():
+    df = listings([
+        ["500 Main St APT 1201", "10001", 40.75, -73.99, TEMPLATE],
+        ["500 Main St APT 1402", "10001", 40.75, -73.99, TEMPLATE],
+        ["500 Main St APT 803", "10001", 40.75, -73.99, TEMPLATE],
+    ])
+    assert len(set(group_listings(df))) == 3
+
+
+def test_short_descriptions_at_neighbouring_addresses_stay_apart():
+    df = listings([
+        ["77 Elm St", "30301", 33.7490, -84.3880, "tiny condo"],
+        ["78 Elm St", "30301", 33.7490, -84.3880, "tiny condo"],
+    ])
+    assert len(set(group_listings(df))) == 2
+
+
+def test_unaddressed_listing_does_not_chain_units():
+    df = listings([
+        ["500 Main St APT 1201", "10001", 40.75, -73.99, TEMPLATE],
+        [None, "10001", 40.75, -73.99, TEMPLATE],
+        ["500 Main St APT 1402", "10001", 40.75, -73.99, TEMPLATE],
+    ])
+    groups = group_listings(df)
+    assert groups[0] != groups[2]
+
+
+def test_relisted_home_is_merged():
+    df = listings([
+        ["12 Oak Ave", "94110", 37.7601, -122.4150, TEMPLATE],
+        ["12 Oak Avenue", "94110", 37.7601, -122.4150, TEMPLATE + " Price reduced!"],
+        [None, "94110", 37.7601, -122.4150, TEMPLATE],
+        ["12 Oak Ave", "94110", 37.7601, -122.4150, "Sold."],
+        ["14 Oak Ave", "94110", 37.7603, -122.4150, TEMPLATE],
+    ])
+    groups = group_listings(df)
+    assert groups[0] == groups[1] == groups[2] == groups[3]
+    assert groups[4] != groups[0]
+
+
+def test_collapse_keeps_most_recent_row_with_history():
+    df = listings([
+        ["12 Oak Ave", "94110", 37.7601, -122.4150, TEMPLATE],
+        ["12 Oak Ave", "94110", 37.7601, -122.4150, TEMPLATE],
+    ]).assign(time=[1, 2], datePostedString=["2021-01-01", "2021-06-01"], event=["Listed for sale", "Sold"],
+              price=[500000.0, 520000.0])
+    collapsed, report = collapse_duplicates(df)
+    assert len(collapsed) == 1 and report["groups_merged"] == 1
+    assert collapsed.iloc[0]["event"] == "Sold"
+    assert collapsed.iloc[0]["eventHistory"] == "2021-01-01|Listed for sale|500000;2021-06-01|Sold|520000"